@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from os import PathLike
 from pathlib import Path
 from typing import List, Optional
 
@@ -20,6 +21,8 @@ class FileDependencies:
 class FileUsages:
     source_file: Path
     file_usages: Optional[List[Path]]
+    # Reaproveitado entre buscas para não reparsear os mesmos arquivos
+    _finder: SymbolFinder = field(default_factory=SymbolFinder, repr=False, compare=False)
 
     def __post_init__(self):
         assert self.source_file, "source_file must not be empty"
@@ -43,8 +46,7 @@ class FileUsages:
             >>> for ref in symbol_refs.references:
             ...     print(f"{ref.location.file_path}:{ref.location.line}")
         """
-        finder = SymbolFinder()
-        return finder.find_references(
+        return self._finder.find_references(
             definition_file=self.source_file,
             dependent_files=self.file_usages or [],
             qualified_name=qualified_name
@@ -53,8 +55,20 @@ class FileUsages:
 
 class Repository:
 
-    def __init__(self, repository_path: Path):
+    def __init__(
+        self,
+        repository_path: Path,
+        cache_dir: Optional[str | PathLike[str]] = None,
+    ):
+        """
+        Args:
+            repository_path: Raiz do repositório
+            cache_dir: Diretório do cache em disco das buscas de símbolos
+                (ver SymbolFinder). None (default) desativa o cache
+        """
         self.repository_path = Path(repository_path).resolve()
+        # Compartilhado pelos FileUsages deste repositório
+        self._finder = SymbolFinder(cache_dir=cache_dir)
 
         # Cria e constrói o grafo
         self._graph = RepoGraph(str(self.repository_path))
@@ -124,7 +138,9 @@ class Repository:
         rel = self._to_rel(file_path)
 
         if rel not in self._graph.graph.nodes:
-            return FileUsages(source_file=file_path, file_usages=[])
+            return FileUsages(
+                source_file=file_path, file_usages=[], _finder=self._finder
+            )
 
         usages_rel = self._graph.usages_of(rel)
         usages_abs = [self._to_abs(r) for r in usages_rel]
@@ -132,4 +148,5 @@ class Repository:
         return FileUsages(
             source_file=file_path.resolve(),
             file_usages=usages_abs,
+            _finder=self._finder,
         )
\ No newline at end of file
@@ -11,18 +11,29 @@ Para entender o algoritmo completo, consulte EXPLAIN.md
 """
 
 from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing, contextmanager
 from dataclasses import dataclass, field
+from fnmatch import translate
+from functools import lru_cache
 from os import PathLike
 from pathlib import Path
-from typing import List, Dict, Set, Tuple, Optional
+from types import MappingProxyType
+from typing import Callable, List, Dict, FrozenSet, Iterator, Mapping, Set, Tuple, Optional, Union
+import hashlib
+import mmap
 import os
-
-import networkx as nx
+import marshal
+import queue
+import re
+import sqlite3
+import sys
 
 # Tree-sitter imports
 from grep_ast import filename_to_lang, TreeContext
 from grep_ast.tsl import get_language, get_parser
-from tree_sitter import Query, QueryCursor
+from tree_sitter import Language, Parser, Query, QueryCursor
 
 # Token counting
 import tiktoken
@@ -31,6 +42,32 @@ import tiktoken
 Tag = namedtuple("Tag", "rel_fname fname line name kind subkind")
 
 
+@lru_cache(maxsize=None)
+def _get_encoding() -> tiktoken.Encoding:
+    """Retorna o tokenizer cl100k_base (usado pelo GPT-4), criado uma única vez."""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _count_blocks_within_budget(blocks: List[str], max_tokens: int) -> int:
+    """
+    Retorna quantos blocos (na ordem dada) cabem no limite de tokens.
+
+    Todos os blocos são tokenizados numa única chamada `encode_ordinary_batch`,
+    que atravessa a fronteira Python/Rust uma vez só em vez de uma vez por bloco.
+    """
+    if not blocks:
+        return 0
+
+    token_counts = [len(tokens) for tokens in _get_encoding().encode_ordinary_batch(blocks)]
+
+    total = 0
+    for i, count in enumerate(token_counts):
+        total += count
+        if total > max_tokens:
+            return i
+    return len(blocks)
+
+
 @dataclass
 class FileReport:
     """Relatório de arquivos processados."""
@@ -48,6 +85,48 @@ class SymbolLocation:
     snippet: str = ""
 
 
+def _render_file_context(
+    tree_contexts: Dict[Tuple[str, int, bool], Tuple[str, TreeContext]],
+    file: str,
+    code: str,
+    lines: List[int],
+    loi_pad: int,
+    parent_context: bool,
+) -> str:
+    """
+    Renderiza linhas (1-indexed) de um arquivo com contexto sintático.
+
+    O TreeContext (parse + escopos) fica em `tree_contexts` e é reaproveitado
+    em renders repetidos, zerando apenas o estado das LOIs. A chave inclui
+    loi_pad e parent_context: definições e referências do mesmo arquivo são
+    renderizadas em paralelo (MultiSymbolNavigation.render), então cada
+    configuração precisa da sua própria instância mutável.
+    """
+    key = (file, loi_pad, parent_context)
+    cached = tree_contexts.get(key)
+    if cached is not None and cached[0] is code:
+        tc = cached[1]
+        tc.lines_of_interest = set()
+        tc.show_lines = set()
+    else:
+        tc = TreeContext(
+            file,
+            code,
+            color=False,
+            loi_pad=loi_pad,
+            margin=0,
+            parent_context=parent_context,
+            child_context=False,
+            last_line=False,
+            show_top_of_file_parent_scope=False,
+        )
+        tree_contexts[key] = (code, tc)
+
+    tc.add_lines_of_interest([line - 1 for line in lines])
+    tc.add_context()
+    return tc.format()
+
+
 @dataclass
 class SymbolNavigation:
     """
@@ -62,6 +141,9 @@ class SymbolNavigation:
     references: List['SymbolLocation']
     source_file: Optional[str] = None
     _files: Dict[str, str] = field(default_factory=dict, repr=False)
+    _tree_contexts: Dict[Tuple[str, int, bool], Tuple[str, TreeContext]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
 
     @property
     def found(self) -> bool:
@@ -121,21 +203,10 @@ class SymbolNavigation:
         # Renderizar definições
         for def_file, lines in defs_by_file.items():
             if def_file in self._files:
-                code = self._files[def_file]
-                tc = TreeContext(
-                    def_file,
-                    code,
-                    color=False,
-                    loi_pad=8,
-                    margin=0,
-                    parent_context=True,
-                    child_context=False,
-                    last_line=False,
-                    show_top_of_file_parent_scope=False,
+                rendered = _render_file_context(
+                    self._tree_contexts, def_file, self._files[def_file], lines,
+                    loi_pad=8, parent_context=True,
                 )
-                tc.add_lines_of_interest([line - 1 for line in lines])
-                tc.add_context()
-                rendered = tc.format()
                 if rendered:
                     output_parts.append(f"{def_file}:")
                     output_parts.append(rendered)
@@ -154,21 +225,10 @@ class SymbolNavigation:
 
             for ref_file, lines in refs_by_file.items():
                 if ref_file in self._files:
-                    code = self._files[ref_file]
-                    tc = TreeContext(
-                        ref_file,
-                        code,
-                        color=False,
-                        loi_pad=4,
-                        margin=0,
-                        parent_context=False,
-                        child_context=False,
-                        last_line=False,
-                        show_top_of_file_parent_scope=False,
+                    rendered = _render_file_context(
+                        self._tree_contexts, ref_file, self._files[ref_file], lines,
+                        loi_pad=4, parent_context=False,
                     )
-                    tc.add_lines_of_interest([line - 1 for line in lines])
-                    tc.add_context()
-                    rendered = tc.format()
                     if rendered:
                         output_parts.append(f"\n{ref_file}:")
                         output_parts.append(rendered)
@@ -187,6 +247,9 @@ class MultiSymbolNavigation:
     symbols: Dict[str, SymbolNavigation]
     _files: Dict[str, str] = field(default_factory=dict, repr=False)
     source_file: Optional[str] = None
+    _tree_contexts: Dict[Tuple[str, int, bool], Tuple[str, TreeContext]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
 
     @property
     def found_symbols(self) -> List[str]:
@@ -214,10 +277,34 @@ class MultiSymbolNavigation:
         """Retorna número de símbolos."""
         return len(self.symbols)
 
+    def _render_one_file(
+        self,
+        file: str,
+        lines: List[int],
+        loi_pad: int,
+        parent_context: bool,
+    ) -> str:
+        """
+        Renderiza um arquivo com TreeContext para as linhas informadas.
+
+        Returns:
+            Bloco "\n<arquivo>:\n<código>" ou string vazia se não houver output
+        """
+        if file not in self._files:
+            return ""
+
+        # Adiciona TODAS as linhas de TODOS os símbolos deste arquivo
+        rendered = _render_file_context(
+            self._tree_contexts, file, self._files[file], sorted(set(lines)),
+            loi_pad=loi_pad, parent_context=parent_context,
+        )
+        return f"\n{file}:\n{rendered}" if rendered else ""
+
     def render(
         self,
         include_references: bool = False,
         show_header: bool = True,
+        max_tokens: Optional[int] = None,
     ) -> str:
         """
         Renderiza TODOS os símbolos de forma agregada.
@@ -230,6 +317,9 @@ class MultiSymbolNavigation:
         Args:
             include_references: Se True, inclui também as referências
             show_header: Se True (default), exibe cabeçalho com metadados
+            max_tokens: Limite de tokens para os blocos de código (None = sem limite).
+                        Blocos são mantidos em ordem (definições, depois referências)
+                        enquanto couberem no limite.
 
         Returns:
             String formatada com contexto sintático agregado
@@ -277,68 +367,59 @@ class MultiSymbolNavigation:
             for defn in nav.definitions:
                 defs_by_file[defn.file].append(defn.line)
 
-        # Renderizar definições (agrupadas por arquivo)
-        if defs_by_file:
-            output_parts.append(f"ℹ️ Definitions ({total_defs} total, {len(defs_by_file)} files)")
-            output_parts.append("-" * 40)
-
-            for file, lines in sorted(defs_by_file.items()):
-                if file in self._files:
-                    code = self._files[file]
-                    tc = TreeContext(
-                        file,
-                        code,
-                        color=False,
-                        loi_pad=8,
-                        margin=0,
-                        parent_context=True,
-                        child_context=False,
-                        last_line=False,
-                        show_top_of_file_parent_scope=False,
-                    )
-                    # Adiciona TODAS as linhas de TODOS os símbolos deste arquivo
-                    unique_lines = sorted(set(lines))
-                    tc.add_lines_of_interest([line - 1 for line in unique_lines])
-                    tc.add_context()
-                    rendered = tc.format()
-                    if rendered:
-                        output_parts.append(f"\n{file}:")
-                        output_parts.append(rendered)
-
         # Agregar referências por arquivo (se solicitado)
+        refs_by_file: Dict[str, List[int]] = defaultdict(list)
         if include_references:
-            refs_by_file: Dict[str, List[int]] = defaultdict(list)
             for symbol in found:
                 nav = self.symbols[symbol]
                 for ref in nav.references:
                     refs_by_file[ref.file].append(ref.line)
 
-            if refs_by_file:
-                output_parts.append("")
-                output_parts.append(f"ℹ️ References ({total_refs} total, {len(refs_by_file)} files)")
-                output_parts.append("-" * 40)
-
-                for file, lines in sorted(refs_by_file.items()):
-                    if file in self._files:
-                        code = self._files[file]
-                        tc = TreeContext(
-                            file,
-                            code,
-                            color=False,
-                            loi_pad=4,
-                            margin=0,
-                            parent_context=False,
-                            child_context=False,
-                            last_line=False,
-                            show_top_of_file_parent_scope=False,
-                        )
-                        unique_lines = sorted(set(lines))
-                        tc.add_lines_of_interest([line - 1 for line in unique_lines])
-                        tc.add_context()
-                        rendered = tc.format()
-                        if rendered:
-                            output_parts.append(f"\n{file}:")
-                            output_parts.append(rendered)
+        # Renderizar arquivos em paralelo (cada arquivo é independente);
+        # map preserva a ordem, então o output é determinístico
+        def_items = sorted(defs_by_file.items())
+        ref_items = sorted(refs_by_file.items())
+        def_blocks: List[str] = []
+        ref_blocks: List[str] = []
+        if def_items or ref_items:
+            max_workers = min(8, max(len(def_items), len(ref_items)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                def_results = executor.map(
+                    lambda item: self._render_one_file(item[0], item[1], 8, True),
+                    def_items,
+                )
+                ref_results = executor.map(
+                    lambda item: self._render_one_file(item[0], item[1], 4, False),
+                    ref_items,
+                )
+                def_blocks = list(def_results)
+                ref_blocks = list(ref_results)
+        def_blocks = [block for block in def_blocks if block]
+        ref_blocks = [block for block in ref_blocks if block]
+
+        # Aplicar limite de tokens (uma única chamada ao tokenizer para todos os blocos)
+        omitted_defs = omitted_refs = 0
+        if max_tokens is not None:
+            kept = _count_blocks_within_budget(def_blocks + ref_blocks, max_tokens)
+            omitted_defs = max(0, len(def_blocks) - kept)
+            omitted_refs = len(ref_blocks) - max(0, kept - len(def_blocks))
+            ref_blocks = ref_blocks[:len(ref_blocks) - omitted_refs]
+            def_blocks = def_blocks[:kept]
+
+        if defs_by_file:
+            output_parts.append(f"ℹ️ Definitions ({total_defs} total, {len(defs_by_file)} files)")
+            output_parts.append("-" * 40)
+            output_parts.extend(def_blocks)
+            if omitted_defs:
+                output_parts.append(f"… {omitted_defs} more files omitted (max_tokens={max_tokens})")
+
+        if refs_by_file:
+            output_parts.append("")
+            output_parts.append(f"ℹ️ References ({total_refs} total, {len(refs_by_file)} files)")
+            output_parts.append("-" * 40)
+            output_parts.extend(ref_blocks)
+            if omitted_refs:
+                output_parts.append(f"… {omitted_refs} more files omitted (max_tokens={max_tokens})")
 
         return "\n".join(output_parts)
 
@@ -348,7 +429,7 @@ class MultiSymbolNavigation:
 # =============================================================================
 
 # Padrões de exclusão padrão (diretórios e arquivos a ignorar)
-DEFAULT_EXCLUDES = {
+DEFAULT_EXCLUDES = frozenset({
     # Controle de versão
     '.git',
     '.svn',
@@ -395,7 +476,34 @@ DEFAULT_EXCLUDES = {
     '.nyc_output',
     '.gradle',
     '.cargo',
-}
+})
+
+_GLOB_CHARS = ('*', '?', '[')
+
+# Exclusões padrão separadas em nomes literais (teste O(1) no frozenset) e
+# globs (só consultados quando o nome não é um literal)
+_EXCLUDE_LITERALS = frozenset(
+    name for name in DEFAULT_EXCLUDES if not any(c in name for c in _GLOB_CHARS)
+)
+_EXCLUDE_GLOBS = tuple(sorted(DEFAULT_EXCLUDES - _EXCLUDE_LITERALS))
+
+
+def _compile_globs(patterns) -> Optional[re.Pattern]:
+    """Compila padrões glob numa única regex (alternação), ou None se vazio."""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{translate(pattern)})' for pattern in patterns))
+
+
+# Todos os globs padrão testados numa única chamada de regex
+_EXCLUDE_GLOB_RE = _compile_globs(_EXCLUDE_GLOBS)
+
+
+def is_excluded(name: str) -> bool:
+    """Verifica se um nome de arquivo/diretório casa com DEFAULT_EXCLUDES."""
+    return name in _EXCLUDE_LITERALS or (
+        _EXCLUDE_GLOB_RE is not None and _EXCLUDE_GLOB_RE.match(name) is not None
+    )
 
 # Mapeamento: extensão -> linguagem Tree-sitter
 EXTENSION_TO_LANG = {
@@ -440,9 +548,12 @@ EXTENSION_TO_LANG = {
     '.rkt': 'racket',
     '.ql': 'ql',
 }
+# Nomes de linguagem internados: várias extensões apontam para o mesmo objeto
+# e comparações/lookups por linguagem caem no caminho rápido por identidade
+EXTENSION_TO_LANG = {ext: sys.intern(lang) for ext, lang in EXTENSION_TO_LANG.items()}
 
-# Mapeamento: linguagem -> arquivo SCM
-SCM_FILES = {
+# Mapeamento: linguagem -> arquivo SCM (somente leitura: resolvido no import)
+SCM_FILES = MappingProxyType({
     'arduino': 'arduino-tags.scm',
     'chatito': 'chatito-tags.scm',
     'commonlisp': 'commonlisp-tags.scm',
@@ -478,34 +589,388 @@ SCM_FILES = {
     'ql': 'ql-tags.scm',
     'scala': 'scala-tags.scm',
     'typescript': 'typescript-tags.scm',
-}
+})
 
 
-def get_lang_from_filename(filename: str) -> Optional[str]:
-    """Detecta a linguagem baseado na extensão do arquivo."""
-    ext = Path(filename).suffix.lower()
-    return EXTENSION_TO_LANG.get(ext)
+_QUERIES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "queries")
+
+# Candidatos por linguagem, já com o caminho completo montado:
+# (tree-sitter-language-pack, fallback tree-sitter-languages)
+_SCM_CANDIDATES: Mapping[str, Tuple[str, str]] = MappingProxyType({
+    sys.intern(lang): (
+        os.path.join(_QUERIES_DIR, "tree-sitter-language-pack", scm_filename),
+        os.path.join(_QUERIES_DIR, "tree-sitter-languages", scm_filename),
+    )
+    for lang, scm_filename in SCM_FILES.items()
+})
+
+
+def _resolve_scm_paths() -> Dict[str, Optional[Path]]:
+    """
+    Resolve, uma única vez, o arquivo SCM de cada linguagem de SCM_FILES.
+
+    Prioriza tree-sitter-language-pack e usa tree-sitter-languages como
+    fallback; linguagens sem arquivo em nenhum dos dois ficam com None.
+    """
+    resolved = {}
+    for lang, candidates in _SCM_CANDIDATES.items():
+        resolved[lang] = next(
+            (Path(candidate) for candidate in candidates if os.path.isfile(candidate)),
+            None,
+        )
+    return resolved
+
+
+# Cache: linguagem -> caminho SCM resolvido (ou None), calculado no import
+_RESOLVED_SCM: Mapping[str, Optional[Path]] = MappingProxyType(_resolve_scm_paths())
 
 
 def get_scm_path(lang: str) -> Optional[Path]:
     """Retorna o caminho do arquivo SCM para a linguagem."""
-    if lang not in SCM_FILES:
+    return _RESOLVED_SCM.get(lang)
+
+
+@lru_cache(maxsize=None)
+def get_scm_query(lang: str) -> Optional[str]:
+    """
+    Retorna o texto da query SCM da linguagem.
+
+    O arquivo é lido do disco uma única vez por linguagem; as chamadas
+    seguintes (uma por arquivo analisado) vêm do cache em memória.
+    """
+    scm_path = get_scm_path(lang)
+    if scm_path is None:
+        return None
+    return scm_path.read_text()
+
+
+# Cache: linguagem -> Query compilada. Compilar a query custa dezenas de
+# milissegundos, então é feito uma vez por linguagem e não por arquivo.
+_COMPILED_QUERIES: Dict[str, Query] = {}
+
+
+def get_scm_query_compiled(lang: str, ts_language) -> Optional[Query]:
+    """
+    Retorna a Query Tree-sitter compilada para a linguagem.
+
+    O cache é indexado pelo nome da linguagem: get_language() devolve um
+    objeto novo a cada chamada, mas todos representam a mesma gramática.
+
+    Args:
+        lang: Nome da linguagem (chave de SCM_FILES)
+        ts_language: Objeto Language do tree-sitter usado na compilação
+
+    Returns:
+        Query compilada, ou None se a linguagem não tem arquivo SCM
+    """
+    query = _COMPILED_QUERIES.get(lang)
+    if query is None:
+        query_text = get_scm_query(lang)
+        if query_text is None:
+            return None
+        query = Query(ts_language, query_text)
+        _COMPILED_QUERIES[lang] = query
+    return query
+
+
+def _classify_capture(capture_name: str) -> Optional[Tuple[str, str]]:
+    """
+    Traduz o nome de uma captura SCM para (kind, subkind).
+
+    Formato: "name.definition.class" → ("def", "class"),
+    "name.reference.call" → ("ref", "call"). Capturas que não são nomes de
+    definição/referência (ex: "definition.class") retornam None.
+    """
+    if "name.definition" in capture_name:
+        kind = "def"
+    elif "name.reference" in capture_name:
+        kind = "ref"
+    else:
+        return None
+
+    parts = capture_name.split(".")
+    subkind = parts[-1] if len(parts) >= 3 else "unknown"
+    return kind, subkind
+
+
+@lru_cache(maxsize=None)
+def _get_lang_bundle(
+    lang: str,
+) -> Tuple[Language, Query, Mapping[str, Tuple[str, str]]]:
+    """
+    Retorna (language, query compilada, metadados das capturas) da linguagem.
+
+    Tudo que get_tags precisa e não depende do arquivo é criado uma única
+    vez por linguagem; por arquivo só resta o parse (com um parser do pool,
+    ver _borrow_parser) e um QueryCursor novo (cursores guardam estado da
+    execução e não podem ser compartilhados). Os metadados mapeiam cada
+    captura relevante da query para (kind, subkind), evitando reclassificar
+    o nome da captura a cada arquivo. Falhas não são cacheadas pelo
+    lru_cache e voltam a ser tentadas.
+    """
+    language = get_language(lang)
+    query = get_scm_query_compiled(lang, language)
+    if query is None:
+        raise ValueError(f"Arquivo SCM não encontrado para: {lang}")
+
+    capture_meta = {}
+    for i in range(query.capture_count):
+        capture_name = query.capture_name(i)
+        meta = _classify_capture(capture_name)
+        if meta is not None:
+            capture_meta[capture_name] = meta
+    return language, query, MappingProxyType(capture_meta)
+
+
+# Pool de parsers por linguagem: linguagem -> fila de Parsers livres
+_PARSER_POOL: Dict[str, "queue.SimpleQueue"] = {}
+
+
+@contextmanager
+def _borrow_parser(lang: str) -> Iterator[Parser]:
+    """
+    Empresta um Parser Tree-sitter da linguagem e o devolve ao pool no final.
+
+    Parsers guardam estado durante o parse e não podem ser usados por duas
+    threads ao mesmo tempo; o pool reaproveita os já criados e só cria um
+    novo quando todos estão emprestados.
+    """
+    pool = _PARSER_POOL.setdefault(lang, queue.SimpleQueue())
+    try:
+        parser = pool.get_nowait()
+    except queue.Empty:
+        parser = get_parser(lang)
+    try:
+        yield parser
+    finally:
+        pool.put(parser)
+
+
+# Tabela fundida: extensão -> (linguagem, caminho SCM resolvido ou None)
+EXTENSION_TO_SCM: Mapping[str, Tuple[str, Optional[Path]]] = MappingProxyType({
+    ext: (lang, _RESOLVED_SCM.get(lang)) for ext, lang in EXTENSION_TO_LANG.items()
+})
+
+
+@lru_cache(maxsize=2048)
+def resolve_file(filename: str) -> Optional[Tuple[str, Optional[Path]]]:
+    """
+    Resolve linguagem e arquivo SCM de um arquivo com um único lookup.
+
+    Extrai a extensão direto da string (sem construir um Path) e memoiza o
+    resultado, já que a mesma chamada se repete para cada arquivo do repo.
+
+    Returns:
+        Tupla (linguagem, caminho SCM ou None), ou None se a extensão
+        não é suportada
+    """
+    dot = filename.rfind('.')
+    # Mesma semântica de Path.suffix: o ponto precisa estar no nome do
+    # arquivo e não pode ser o primeiro caractere (ex: ".bashrc")
+    name_start = max(filename.rfind('/'), filename.rfind(os.sep)) + 1
+    if dot <= name_start:
         return None
+    ext = filename[dot:]
+    entry = EXTENSION_TO_SCM.get(ext)
+    if entry is None:
+        # Só aloca a versão minúscula quando a extensão não está no formato usual
+        entry = EXTENSION_TO_SCM.get(ext.lower())
+    return entry
+
+
+def get_lang_from_filename(filename: str) -> Optional[str]:
+    """Detecta a linguagem baseado na extensão do arquivo."""
+    entry = resolve_file(filename)
+    return entry[0] if entry else None
+
+
+# =============================================================================
+# PageRank
+# =============================================================================
+
+# Identificadores ignorados na construção das arestas do grafo (continuam nas
+# tags e no output): nomes curtos, nomes genéricos e nomes definidos em mais
+# de max(_COMMON_NAME_MIN_FILES, _COMMON_NAME_FILE_RATIO * arquivos) arquivos
+_MIN_EDGE_NAME_LEN = 3
+_COMMON_NAME_MIN_FILES = 5
+_COMMON_NAME_FILE_RATIO = 0.1
+_EDGE_STOPLIST = frozenset({
+    'self', 'cls', 'get', 'set', 'init', 'main', 'run', 'new',
+    '__init__', '__call__', '__repr__', '__str__', '__eq__', '__hash__',
+})
+
+
+def _names_pattern(names: Set[str]) -> "re.Pattern":
+    """
+    Regex que encontra qualquer um dos nomes como identificador inteiro.
+
+    Usada como pré-filtro textual barato: arquivos sem nenhuma ocorrência
+    não podem gerar tags com esses nomes e dispensam o Tree-sitter.
+    """
+    alternatives = "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)")
+
+
+def _pagerank(
+    nodes: List[str],
+    edge_weights: Dict[Tuple[str, str], float],
+    personalization: Dict[str, float],
+    alpha: float = 0.85,
+    max_iter: int = 100,
+    tol: float = 1.0e-6,
+) -> Dict[str, float]:
+    """
+    PageRank personalizado por iteração de potência sobre a lista de arestas.
+
+    Mesma formulação do nx.pagerank: pesos de saída normalizados por nó,
+    massa dos nós sem saída (dangling) redistribuída conforme a
+    personalização, e parada quando a variação L1 fica abaixo de
+    len(nodes) * tol. Trabalha direto sobre arrays de índices, sem montar
+    um grafo NetworkX nem depender de scipy.
+
+    Args:
+        nodes: Nós do grafo (arquivos)
+        edge_weights: {(origem, destino): peso}
+        personalization: {nó: peso} (normalizado internamente)
+        alpha: Fator de amortecimento
+        max_iter: Número máximo de iterações
+        tol: Tolerância de convergência
+
+    Returns:
+        Dicionário {nó: rank}, com ranks somando 1
+    """
+    total = sum(personalization.values())
+
+    # Sem arestas todos os nós são dangling e a iteração converge, já no
+    # primeiro passo, para a própria personalização normalizada
+    if not edge_weights:
+        return {node: personalization.get(node, 0.0) / total for node in nodes}
+
+    n = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+
+    out_weight = [0.0] * n
+    for (src, _), weight in edge_weights.items():
+        out_weight[index[src]] += weight
+
+    # Arestas em estrutura de arrays (origem, destino, peso normalizado)
+    srcs, dsts, weights = [], [], []
+    for (src, dst), weight in edge_weights.items():
+        i = index[src]
+        srcs.append(i)
+        dsts.append(index[dst])
+        weights.append(weight / out_weight[i])
+
+    p = [personalization.get(node, 0.0) / total for node in nodes]
+    dangling = [i for i in range(n) if out_weight[i] == 0.0]
+
+    x = [1.0 / n] * n
+    for _ in range(max_iter):
+        x_last = x
+        dangle_sum = alpha * sum(x_last[i] for i in dangling)
+        x = [(dangle_sum + 1.0 - alpha) * p_i for p_i in p]
+        for i, j, weight in zip(srcs, dsts, weights):
+            x[j] += alpha * x_last[i] * weight
+        if sum(abs(a - b) for a, b in zip(x, x_last)) < n * tol:
+            break
+
+    return dict(zip(nodes, x))
+
+
+# =============================================================================
+# Cache de tags em disco
+# =============================================================================
 
-    scm_filename = SCM_FILES[lang]
-    base_dir = Path(__file__).parent / "queries"
+# Nome do arquivo SQLite do cache; a versão muda quando o formato das tags ou
+# as queries SCM mudarem, invalidando caches antigos
+_TAGS_CACHE_FILE = "tags.v3.sqlite"
 
-    # Tentar tree-sitter-language-pack primeiro
-    scm_path = base_dir / "tree-sitter-language-pack" / scm_filename
-    if scm_path.exists():
-        return scm_path
+# Máximo de parâmetros por consulta "IN (...)" (limite antigo do SQLite: 999)
+_SQLITE_MAX_PARAMS = 900
 
-    # Fallback para tree-sitter-languages
-    scm_path = base_dir / "tree-sitter-languages" / scm_filename
-    if scm_path.exists():
-        return scm_path
 
-    return None
+def _open_tags_cache(cache_dir: Path) -> sqlite3.Connection:
+    """Abre (criando se preciso) o banco SQLite do cache de tags."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(cache_dir / _TAGS_CACHE_FILE))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS tags ("
+        "fname TEXT PRIMARY KEY, digest BLOB NOT NULL, tags BLOB NOT NULL)"
+    )
+    return conn
+
+
+def _code_digest(code: str) -> bytes:
+    """Hash do conteúdo do arquivo, usado para validar entradas do cache."""
+    return hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _load_cached_tags(conn: sqlite3.Connection, fnames: List[str]) -> Dict[str, Tuple[bytes, bytes]]:
+    """Retorna {fname: (digest, tags serializadas)} das entradas existentes."""
+    stored = {}
+    for start in range(0, len(fnames), _SQLITE_MAX_PARAMS):
+        chunk = fnames[start:start + _SQLITE_MAX_PARAMS]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT fname, digest, tags FROM tags WHERE fname IN ({placeholders})",
+            chunk,
+        )
+        for fname, digest, tags in rows:
+            stored[fname] = (digest, tags)
+    return stored
+
+
+# =============================================================================
+# Extração de tags em processos paralelos
+# =============================================================================
+
+# Estimativa de tokens por tag no mapa, usada como ponto de partida da busca
+# pelo número de tags que cabem no limite
+_EST_TOKENS_PER_TAG = 25
+
+# Folga da extrapolação tokens/tag ao escolher o próximo probe da busca
+# exponencial: mirar um pouco acima do limite para delimitar o intervalo
+_PROBE_OVERSHOOT = 1.1
+
+# Tamanho máximo (bytes) de arquivo analisado; acima disso normalmente é
+# código gerado/minificado, cujo parse domina o tempo total sem agregar ao mapa
+DEFAULT_MAX_FILE_BYTES = 512 * 1024
+
+# Quantidade mínima de arquivos para ler num ThreadPoolExecutor, e máximo de
+# threads de leitura (I/O libera o GIL, então pode passar do número de núcleos)
+_PARALLEL_READ_MIN_FILES = 32
+_MAX_READ_WORKERS = 32
+
+# Arquivos a partir deste tamanho são mapeados em memória e decodificados
+# direto do mapeamento, sem um buffer de bytes intermediário do mesmo tamanho
+_MMAP_MIN_BYTES = 256 * 1024
+
+# Bytes iniciais inspecionados em busca de um byte nulo: arquivos com
+# extensão suportada mas conteúdo binário são ignorados antes do decode
+_BINARY_SNIFF_BYTES = 4096
+
+# TreeContexts mantidos por render_tree durante um get_repo_map (LRU). Cada
+# instância guarda nós e escopos de todas as linhas do arquivo; manter todas
+# pesa na coleta de lixo mais do que economiza em parsing
+_TREE_CONTEXT_CACHE_SIZE = 8
+
+# Quantidade mínima de arquivos para extrair tags num ProcessPoolExecutor
+_PARALLEL_TAGS_MIN_FILES = 32
+
+# Instância usada por cada processo worker (criada em _init_tags_worker)
+_worker_mapper: Optional["SimpleRepoMap"] = None
+
+
+def _init_tags_worker(root: str, verbose: bool) -> None:
+    """Inicializa o SimpleRepoMap do processo worker."""
+    global _worker_mapper
+    _worker_mapper = SimpleRepoMap(root=root, verbose=verbose)
+
+
+def _extract_tags_worker(item: Tuple[str, str, str]) -> List[Tag]:
+    """Extrai as tags de um arquivo (fname, rel_fname, code) no worker."""
+    return _worker_mapper.get_tags(*item)
 
 
 # =============================================================================
@@ -532,19 +997,36 @@ class SimpleRepoMap:
         root: str | PathLike[str] = ".",
         max_map_tokens: int = 8192,
         verbose: bool = False,
+        cache_dir: Optional[str | PathLike[str]] = None,
+        max_file_bytes: Optional[int] = DEFAULT_MAX_FILE_BYTES,
     ):
         """
         Args:
             root: Diretório raiz do projeto
             max_map_tokens: Limite máximo de tokens no output (default: 8192)
             verbose: Se True, imprime mensagens de debug
+            cache_dir: Diretório do cache em disco (SQLite) das tags extraídas,
+                reaproveitado entre execuções. None (default) desativa o cache
+            max_file_bytes: Arquivos maiores que isso são ignorados
+                (default: 512KB). None desativa o limite
         """
         self.root = Path(root).resolve()
         self.max_map_tokens = max_map_tokens
         self.verbose = verbose
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_file_bytes = max_file_bytes
 
         # Inicializar tokenizer (cl100k_base é usado pelo GPT-4)
-        self._encoding = tiktoken.get_encoding("cl100k_base")
+        self._encoding = _get_encoding()
+
+        # Cache de render_tree: (rel_fname, LOIs) -> (conteúdo, renderização)
+        # Limpo a cada get_repo_map para não acumular entre chamadas
+        self._render_cache: Dict[Tuple[str, Tuple[int, ...]], Tuple[str, str]] = {}
+
+        # TreeContext já construído (parse + escopos) por arquivo:
+        # rel_fname -> (conteúdo, TreeContext). Mesmo ciclo de vida do
+        # _render_cache
+        self._tree_context_cache: Dict[str, Tuple[str, TreeContext]] = {}
 
     def _log(self, msg: str):
         """Imprime mensagem se verbose=True."""
@@ -562,6 +1044,10 @@ class SimpleRepoMap:
         Para textos longos (>200 chars), usa amostragem para estimar
         o número de tokens de forma mais eficiente.
 
+        Usa `encode_ordinary`: o texto é código do usuário, então marcadores
+        como "<|endoftext|>" são contados como texto comum (com `encode` eles
+        disparariam ValueError), e a checagem de tokens especiais é evitada.
+
         Args:
             text: Texto para contar tokens
 
@@ -575,14 +1061,14 @@ class SimpleRepoMap:
 
         # Para textos curtos, contar diretamente
         if len_text < 200:
-            return len(self._encoding.encode(text))
+            return len(self._encoding.encode_ordinary(text))
 
         # Para textos longos, usar amostragem
         lines = text.splitlines(keepends=True)
         num_lines = len(lines)
 
         if num_lines == 0:
-            return len(self._encoding.encode(text))
+            return len(self._encoding.encode_ordinary(text))
 
         # Amostrar ~100 linhas distribuídas pelo texto
         step = max(1, num_lines // 100)
@@ -590,10 +1076,10 @@ class SimpleRepoMap:
         sample_text = "".join(sampled_lines)
 
         if not sample_text:
-            return len(self._encoding.encode(text))
+            return len(self._encoding.encode_ordinary(text))
 
         # Contar tokens da amostra e extrapolar
-        sample_tokens = len(self._encoding.encode(sample_text))
+        sample_tokens = len(self._encoding.encode_ordinary(sample_text))
         est_tokens = (sample_tokens / len(sample_text)) * len_text
 
         return int(est_tokens)
@@ -602,7 +1088,9 @@ class SimpleRepoMap:
     # Extração de Tags com Tree-sitter
     # =========================================================================
 
-    def get_tags(self, fname: str, rel_fname: str, code: str) -> List[Tag]:
+    def get_tags(
+        self, fname: str, rel_fname: str, code: Union[str, bytes]
+    ) -> List[Tag]:
         """
         Extrai tags do código usando Tree-sitter.
 
@@ -613,84 +1101,188 @@ class SimpleRepoMap:
         Args:
             fname: Caminho absoluto do arquivo
             rel_fname: Caminho relativo do arquivo
-            code: Conteúdo do arquivo
+            code: Conteúdo do arquivo (str, ou bytes UTF-8 já lidos do
+                disco, repassados ao Tree-sitter sem cópia)
 
         Returns:
             Lista de Tags (definições e referências)
         """
-        # Detectar linguagem
-        lang = filename_to_lang(fname)
-        if not lang:
-            lang = get_lang_from_filename(fname)
+        # Detectar linguagem e arquivo SCM: extensões conhecidas resolvem os
+        # dois num único lookup; o restante cai no detector do grep_ast
+        resolved = resolve_file(fname)
+        if resolved:
+            lang, scm_path = resolved
+        else:
+            lang = filename_to_lang(fname)
+            scm_path = get_scm_path(lang) if lang else None
 
         if not lang:
             self._log(f"Linguagem não detectada para: {fname}")
             return []
 
-        # Obter parser e linguagem
-        try:
-            language = get_language(lang)
-            parser = get_parser(lang)
-        except Exception as e:
-            self._log(f"Erro ao obter parser para {lang}: {e}")
-            return []
-
-        # Obter arquivo SCM de queries
-        scm_path = get_scm_path(lang)
+        # Arquivo SCM de queries
         if not scm_path:
             self._log(f"Arquivo SCM não encontrado para: {lang}")
             return []
 
-        # Ler queries SCM
+        # Obter linguagem, query compilada e metadados das capturas
+        # (cacheados por linguagem)
         try:
-            query_text = scm_path.read_text()
+            language, query, capture_meta = _get_lang_bundle(lang)
         except Exception as e:
-            self._log(f"Erro ao ler {scm_path}: {e}")
+            self._log(f"Erro ao obter parser/queries para {lang}: {e}")
             return []
 
         # Fazer parsing do código
         try:
-            tree = parser.parse(bytes(code, "utf-8"))
-            query = Query(language, query_text)
+            with _borrow_parser(lang) as parser:
+                source = code if isinstance(code, bytes) else code.encode("utf-8")
+                tree = parser.parse(source)
             cursor = QueryCursor(query)
             captures = cursor.captures(tree.root_node)
         except Exception as e:
             self._log(f"Erro ao fazer parsing de {fname}: {e}")
             return []
 
-        # Processar capturas
+        # Processar capturas. Tag._make monta a tupla direto, sem passar
+        # pelo __new__ com argumentos nomeados do namedtuple a cada captura
         tags = []
+        make_tag = Tag._make
         for capture_name, nodes in captures.items():
-            # Determinar tipo de tag baseado no nome da captura
-            # Formato: "name.definition.class" ou "name.reference.call"
-            if "name.definition" in capture_name:
-                kind = "def"
-            elif "name.reference" in capture_name:
-                kind = "ref"
-            else:
-                continue  # Ignorar outras capturas
-
-            # Extrair subkind: "name.definition.class" → "class"
-            parts = capture_name.split(".")
-            subkind = parts[-1] if len(parts) >= 3 else "unknown"
+            # (kind, subkind) pré-calculados; None = captura ignorada
+            meta = capture_meta.get(capture_name)
+            if meta is None:
+                continue
+            kind, subkind = meta
 
             for node in nodes:
-                line_num = node.start_point[0] + 1  # Tree-sitter usa 0-indexed
-                name = node.text.decode('utf-8') if node.text else ""
-
-                if name:  # Só adicionar se tem nome
-                    tags.append(Tag(
-                        rel_fname=rel_fname,
-                        fname=fname,
-                        line=line_num,
-                        name=name,
-                        kind=kind,
-                        subkind=subkind,
-                    ))
+                # Fatiar o buffer já em mãos custa metade de node.text, que
+                # copia o trecho através do binding
+                text = source[node.start_byte:node.end_byte]
+                if text:  # Só adicionar se tem nome
+                    tags.append(make_tag((
+                        rel_fname,
+                        fname,
+                        node.start_point[0] + 1,  # Tree-sitter usa 0-indexed
+                        sys.intern(text.decode('utf-8')),
+                        kind,
+                        subkind,
+                    )))
 
         self._log(f"Tree-sitter extraiu {len(tags)} tags de {rel_fname} ({lang})")
         return tags
 
+    def _extract_all_tags(self, items: List[Tuple[str, str, str]]) -> List[List[Tag]]:
+        """
+        Extrai tags de vários arquivos, na mesma ordem de `items`.
+
+        Com `cache_dir` configurado, arquivos cujo conteúdo não mudou desde a
+        última execução têm as tags lidas do cache em disco; só os demais
+        passam pelo Tree-sitter, e o resultado é gravado de volta.
+
+        Args:
+            items: Lista de (caminho absoluto, caminho relativo, conteúdo)
+
+        Returns:
+            Lista com as tags de cada arquivo
+        """
+        if self.cache_dir is None:
+            return self._extract_tags_uncached(items)
+
+        try:
+            conn = _open_tags_cache(self.cache_dir)
+        except (OSError, sqlite3.Error) as e:
+            self._log(f"Cache de tags indisponível ({e}), extraindo sem cache")
+            return self._extract_tags_uncached(items)
+
+        with closing(conn):
+            digests = [_code_digest(code) for _, _, code in items]
+            stored = _load_cached_tags(conn, [fname for fname, _, _ in items])
+
+            results: List[Optional[List[Tag]]] = [None] * len(items)
+            make_tag = Tag._make
+            misses = []
+            for i, ((fname, rel_fname, _), digest) in enumerate(zip(items, digests)):
+                entry = stored.get(fname)
+                if entry is not None and entry[0] == digest:
+                    # Tuplas (line, name, kind, subkind) em marshal: decodificar
+                    # é cerca de 2x mais rápido que JSON e, ao contrário de
+                    # pickle, não executa código vindo do arquivo do cache.
+                    # _make evita desempacotar os campos a cada tag
+                    prefix = (rel_fname, fname)
+                    try:
+                        results[i] = [
+                            make_tag(prefix + row) for row in marshal.loads(entry[1])
+                        ]
+                        continue
+                    except (EOFError, ValueError, TypeError):
+                        # Entrada corrompida ou em outro formato: extrair de novo
+                        pass
+                misses.append(i)
+
+            self._log(f"Cache de tags: {len(items) - len(misses)} hits, {len(misses)} misses")
+
+            fresh = self._extract_tags_uncached([items[i] for i in misses])
+            for i, tags in zip(misses, fresh):
+                results[i] = tags
+
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO tags (fname, digest, tags) VALUES (?, ?, ?)",
+                        [
+                            (
+                                items[i][0],
+                                digests[i],
+                                marshal.dumps(
+                                    [(t.line, t.name, t.kind, t.subkind) for t in tags]
+                                ),
+                            )
+                            for i, tags in zip(misses, fresh)
+                        ],
+                    )
+            except sqlite3.Error as e:
+                self._log(f"Erro ao gravar cache de tags: {e}")
+
+        return results
+
+    def _extract_tags_uncached(self, items: List[Tuple[str, str, str]]) -> List[List[Tag]]:
+        """
+        Extrai tags via Tree-sitter, na mesma ordem de `items`.
+
+        Parsing com Tree-sitter é CPU-bound, então a partir de
+        _PARALLEL_TAGS_MIN_FILES arquivos (e com mais de um núcleo) o
+        trabalho é distribuído num ProcessPoolExecutor. Abaixo disso o custo
+        de subir os processos e serializar código/tags não compensa.
+
+        Os arquivos são despachados do maior para o menor (heurística LPT,
+        com o tamanho do conteúdo já em memória): um arquivo grande no fim
+        da fila deixaria os outros workers ociosos esperando por ele.
+        """
+        workers = min(os.cpu_count() or 1, len(items))
+        if len(items) < _PARALLEL_TAGS_MIN_FILES or workers <= 1:
+            return [self.get_tags(*item) for item in items]
+
+        order = sorted(range(len(items)), key=lambda i: len(items[i][2]), reverse=True)
+        chunksize = max(1, len(items) // (4 * workers))
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_tags_worker,
+                initargs=(str(self.root), self.verbose),
+            ) as executor:
+                results: List[List[Tag]] = [None] * len(items)
+                extracted = executor.map(
+                    _extract_tags_worker, [items[i] for i in order], chunksize=chunksize
+                )
+                for i, tags in zip(order, extracted):
+                    results[i] = tags
+                return results
+        except (OSError, BrokenProcessPool) as e:
+            # Ambientes sem suporte a multiprocessing: seguir sequencialmente
+            self._log(f"Extração paralela indisponível ({e}), usando modo sequencial")
+            return [self.get_tags(*item) for item in items]
+
     # =========================================================================
     # PageRank e Ranking
     # =========================================================================
@@ -701,6 +1293,7 @@ class SimpleRepoMap:
         chat_fnames: Optional[Set[str]] = None,
         mentioned_idents: Optional[Set[str]] = None,
         kinds: Optional[Set[str]] = None,
+        names: Optional[Set[str]] = None,
     ) -> Tuple[List[Tuple[float, Tag]], FileReport]:
         """
         Ranqueia tags usando PageRank.
@@ -716,6 +1309,9 @@ class SimpleRepoMap:
             chat_fnames: Arquivos de alta prioridade (sendo editados)
             mentioned_idents: Identificadores mencionados na conversa
             kinds: Tipos de tags a incluir (default: {"def"} apenas definições)
+            names: Se informado, só tags com esses nomes entram no ranking.
+                Com PageRank o grafo continua usando todas as tags; sem ele,
+                só arquivos que mencionam algum dos nomes são analisados
 
         Returns:
             Tupla (lista de (rank, tag), FileReport)
@@ -725,85 +1321,121 @@ class SimpleRepoMap:
         if kinds is None:
             kinds = {"def"}
 
-        # 1. Coletar todas as tags
-        defines = defaultdict(set)      # nome -> {arquivos que definem}
-        references = defaultdict(set)   # nome -> {arquivos que referenciam}
-        all_tags = []
+        # 1. Configurar personalização do PageRank
+        # chat_files recebem peso inicial 100x maior
+        nodes = list(files.keys())
+        personalization = {
+            fname: 100.0 for fname in chat_fnames if fname in files
+        }
+
+        # 2. Coletar todas as tags
+        # Cada arquivo aparece uma única vez no loop, então basta deduplicar
+        # os nomes dentro do arquivo para que as listas não tenham repetição
+        build_graph = bool(personalization and nodes)
+        defines: Dict[str, List[str]] = {}      # nome -> [arquivos que definem]
+        references: Dict[str, List[str]] = {}   # nome -> [arquivos que referenciam]
+        tags_by_file: List[Tuple[str, List[Tag]]] = []
         definition_count = 0
         reference_count = 0
 
-        for rel_fname, code in files.items():
-            # Construir caminho absoluto
-            abs_fname = str(self.root / rel_fname)
+        # Sem PageRank o grafo não é usado, então com `names` basta extrair
+        # tags dos arquivos que mencionam algum dos nomes (a contagem de
+        # definições/referências do relatório cobre só esses arquivos)
+        scanned = files
+        if names and not personalization:
+            pattern = _names_pattern(names)
+            scanned = {
+                rel_fname: code
+                for rel_fname, code in files.items()
+                if pattern.search(code)
+            }
+
+        # (caminho absoluto, caminho relativo, conteúdo) de cada arquivo
+        items = [
+            (str(self.root / rel_fname), rel_fname, code)
+            for rel_fname, code in scanned.items()
+        ]
 
-            tags = self.get_tags(abs_fname, rel_fname, code)
-            all_tags.extend(tags)
+        for (_, rel_fname, _), tags in zip(items, self._extract_all_tags(items)):
+            tags_by_file.append((rel_fname, tags))
 
+            def_names = set()
+            ref_names = set()
             for tag in tags:
                 if tag.kind == "def":
-                    defines[tag.name].add(rel_fname)
+                    def_names.add(tag.name)
                     definition_count += 1
                 elif tag.kind == "ref":
-                    references[tag.name].add(rel_fname)
+                    ref_names.add(tag.name)
                     reference_count += 1
 
-        # 2. Construir grafo de dependências
-        G = nx.MultiDiGraph()
-
-        # Adicionar todos os arquivos como nós
-        for rel_fname in files.keys():
-            G.add_node(rel_fname)
-
-        # Adicionar arestas: arquivo que referencia -> arquivo que define
-        for name, ref_fnames in references.items():
-            def_fnames = defines.get(name, set())
-            for ref_fname in ref_fnames:
-                for def_fname in def_fnames:
-                    if ref_fname != def_fname:
-                        G.add_edge(ref_fname, def_fname, name=name)
-
-        # 3. Configurar personalização do PageRank
-        # chat_files recebem peso inicial 100x maior
-        personalization = {}
-        if chat_fnames:
-            for fname in chat_fnames:
-                if fname in G.nodes():
-                    personalization[fname] = 100.0
-
-        # 4. Executar PageRank
-        if personalization and len(G.nodes()) > 0:
-            try:
-                ranks = nx.pagerank(G, personalization=personalization, alpha=0.85)
-            except Exception:
-                # Fallback se PageRank falhar (ex: numpy não instalado)
-                ranks = {node: 1.0 for node in G.nodes()}
-                # Aplicar personalização manualmente como fallback simples
-                for fname, weight in personalization.items():
-                    if fname in ranks:
-                        ranks[fname] = weight
+            # Sem PageRank o grafo não é montado (ver passo 3)
+            if not build_graph:
+                continue
+            for name in def_names:
+                fnames = defines.get(name)
+                if fnames is None:
+                    defines[name] = [rel_fname]
+                else:
+                    fnames.append(rel_fname)
+            for name in ref_names:
+                fnames = references.get(name)
+                if fnames is None:
+                    references[name] = [rel_fname]
+                else:
+                    fnames.append(rel_fname)
+
+        # 3. Construir grafo de dependências e executar PageRank. Sem
+        # personalização todos os arquivos têm o mesmo rank, então o grafo
+        # nem é montado (caso comum em find_symbol sem source_file)
+        if build_graph:
+            # Arestas: arquivo que referencia -> arquivo que define, com peso
+            # igual ao número de identificadores que ligam o par.
+            # Nomes definidos em muitos arquivos (ex: __init__, get, run)
+            # ligam quase todos os arquivos entre si sem dizer nada sobre
+            # dependência
+            max_def_files = max(_COMMON_NAME_MIN_FILES, _COMMON_NAME_FILE_RATIO * len(files))
+            edge_weights = defaultdict(float)
+            for name, ref_fnames in references.items():
+                def_fnames = defines.get(name)
+                if not def_fnames:
+                    continue
+                if (
+                    len(name) < _MIN_EDGE_NAME_LEN
+                    or name in _EDGE_STOPLIST
+                    or len(def_fnames) > max_def_files
+                ):
+                    continue
+                for ref_fname in ref_fnames:
+                    for def_fname in def_fnames:
+                        if ref_fname != def_fname:
+                            edge_weights[(ref_fname, def_fname)] += 1.0
+
+            ranks = _pagerank(nodes, edge_weights, personalization, alpha=0.85)
         else:
-            ranks = {node: 1.0 for node in G.nodes()}
+            ranks = {node: 1.0 for node in nodes}
 
-        # 5. Aplicar boosts e criar ranking final
+        # 4. Aplicar boosts e criar ranking final
+        # Rank do arquivo e boost de chat file (20x) valem para todas as tags
+        # do arquivo: calculados uma vez por arquivo, já nas duas variantes
+        # (com e sem o boost de identificador mencionado, 10x)
         ranked_tags = []
 
-        for tag in all_tags:
-            if tag.kind not in kinds:
-                continue
-
-            file_rank = ranks.get(tag.rel_fname, 0.0)
-            boost = 1.0
-
-            # Boost para identificadores mencionados (10x)
-            if tag.name in mentioned_idents:
-                boost *= 10.0
+        for rel_fname, tags in tags_by_file:
+            file_rank = ranks.get(rel_fname, 0.0)
+            chat_boost = 20.0 if rel_fname in chat_fnames else 1.0
+            plain_rank = file_rank * chat_boost
+            mentioned_rank = file_rank * (10.0 * chat_boost)
 
-            # Boost para chat files (20x)
-            if tag.rel_fname in chat_fnames:
-                boost *= 20.0
-
-            final_rank = file_rank * boost
-            ranked_tags.append((final_rank, tag))
+            for tag in tags:
+                if tag.kind not in kinds:
+                    continue
+                if names is not None and tag.name not in names:
+                    continue
+                if tag.name in mentioned_idents:
+                    ranked_tags.append((mentioned_rank, tag))
+                else:
+                    ranked_tags.append((plain_rank, tag))
 
         # Ordenar por rank (maior primeiro), depois por arquivo e linha
         ranked_tags.sort(key=lambda x: (-x[0], x[1].rel_fname, x[1].line))
@@ -846,28 +1478,53 @@ class SimpleRepoMap:
         if not code or not lois:
             return ""
 
-        # Criar TreeContext para cada renderização
-        # (TreeContext acumula LOIs, então precisamos de instância fresca)
-        # Configuração sem contexto - apenas as linhas de definição (estilo Aider)
-        tc = TreeContext(
-                rel_fname,
-                code,
-                color=False,
-                line_number=False,
-                child_context=False,
-                last_line=False,
-                margin=0,
-                mark_lois=False,
-                loi_pad=0,
-                # header_max=30,
-                show_top_of_file_parent_scope=False,
-        )
+        # A busca binária renderiza o mesmo arquivo com as mesmas LOIs em
+        # várias iterações; reaproveitar a renderização anterior quando o
+        # conteúdo é o mesmo objeto
+        key = (rel_fname, tuple(sorted(set(lois))))
+        cached = self._render_cache.get(key)
+        if cached is not None and cached[0] is code:
+            return cached[1]
+
+        # O TreeContext faz parse e análise de escopos no construtor; o mesmo
+        # arquivo aparece com LOIs diferentes a cada iteração da busca
+        # binária, então a instância é reaproveitada e só o estado das LOIs
+        # é zerado (TreeContext acumula LOIs entre chamadas). Só os arquivos
+        # na fronteira da busca mudam de LOIs entre iterações (os demais
+        # caem no _render_cache), então poucas instâncias bastam
+        cached_tc = self._tree_context_cache.pop(rel_fname, None)
+        if cached_tc is not None and cached_tc[0] is code:
+            tc = cached_tc[1]
+            tc.lines_of_interest = set()
+            tc.show_lines = set()
+            self._tree_context_cache[rel_fname] = cached_tc  # mais recente
+        else:
+            # Configuração sem contexto - apenas as linhas de definição (estilo Aider)
+            tc = TreeContext(
+                    rel_fname,
+                    code,
+                    color=False,
+                    line_number=False,
+                    child_context=False,
+                    last_line=False,
+                    margin=0,
+                    mark_lois=False,
+                    loi_pad=0,
+                    # header_max=30,
+                    show_top_of_file_parent_scope=False,
+            )
+            self._tree_context_cache[rel_fname] = (code, tc)
+            if len(self._tree_context_cache) > _TREE_CONTEXT_CACHE_SIZE:
+                # Descartar o menos recente (dict mantém ordem de inserção)
+                del self._tree_context_cache[next(iter(self._tree_context_cache))]
 
         # Adicionar linhas de interesse (converter de 1-indexed para 0-indexed)
         tc.add_lines_of_interest([line - 1 for line in lois])
         tc.add_context()
 
-        return tc.format()
+        rendered = tc.format()
+        self._render_cache[key] = (code, rendered)
+        return rendered
 
     def _to_tree(
         self,
@@ -937,8 +1594,13 @@ class SimpleRepoMap:
         """
         Gera árvore de código truncada para caber no limite de tokens.
 
-        Usa busca binária para encontrar eficientemente o número
-        máximo de tags que cabem no limite. Complexidade: O(log n).
+        Parte de uma estimativa (max_tokens / _EST_TOKENS_PER_TAG tags) e,
+        enquanto couber, extrapola a razão tokens/tag medida para mirar logo
+        acima do limite (no máximo dobrando); depois faz busca binária no
+        intervalo encontrado, para achar o número máximo de tags que cabem.
+        Complexidade: O(log n) renderizações, e nenhuma delas muito maior
+        que o resultado final (cada arquivo novo no probe é um parse do
+        TreeContext, o custo dominante).
 
         Args:
             ranked_tags: Lista de (rank, tag) ordenada por rank
@@ -961,7 +1623,6 @@ class SimpleRepoMap:
             tokens = self._token_count(tree_output)
             return tree_output, tokens
 
-        # Busca binária
         left, right = 1, len(ranked_tags)
         best_tree = ""
         best_tokens = 0
@@ -969,6 +1630,36 @@ class SimpleRepoMap:
         self._log(f"Busca binária: {len(ranked_tags)} tags, limite {max_tokens} tokens")
 
         iterations = 0
+
+        # Busca exponencial: como os tokens crescem com o número de tags,
+        # avançar a partir de uma estimativa delimita o intervalo sem começar
+        # renderizando metade de todas as tags (em repositórios grandes o
+        # limite costuma caber numa fração pequena delas)
+        probe = min(right, max(1, max_tokens // _EST_TOKENS_PER_TAG))
+        while probe <= right:
+            tree_output, tokens = try_tags(probe)
+            iterations += 1
+
+            self._log(f"  Iteração {iterations}: probe={probe}, tokens={tokens}")
+
+            if tokens > max_tokens:
+                right = probe - 1
+                break
+
+            best_tree = tree_output
+            best_tokens = tokens
+            left = probe + 1
+            # Mirar logo acima do limite usando a razão tokens/tag medida
+            # (com folga de _PROBE_OVERSHOOT), em vez de dobrar às cegas: o
+            # intervalo da busca binária fica estreito e arquivos que nunca
+            # entrariam no mapa não chegam a ser renderizados
+            if tokens > 0:
+                target = int(probe * max_tokens * _PROBE_OVERSHOOT / tokens)
+                probe = min(2 * probe, max(probe + 1, target))
+            else:
+                probe *= 2
+
+        # Busca binária dentro do intervalo delimitado
         while left <= right:
             mid = (left + right) // 2
             tree_output, tokens = try_tags(mid)
@@ -1040,11 +1731,12 @@ class SimpleRepoMap:
             )
 
         # 2. Ler conteúdo dos arquivos
-        files = self._read_files(file_paths)
+        excluded: Dict[str, str] = {}
+        files = self._read_files(file_paths, excluded)
 
         if not files:
             return "No supported files found.", FileReport(
-                excluded={},
+                excluded=excluded,
                 definition_matches=0,
                 reference_matches=0,
                 total_files_considered=0,
@@ -1052,9 +1744,16 @@ class SimpleRepoMap:
 
         # 3. Ranquear tags
         ranked_tags, report = self._get_ranked_tags(files, chat_fnames, mentioned_idents)
+        report.excluded.update(excluded)
 
         # 4. Gerar output com busca binária para otimizar tokens
-        tree = self._to_tree_truncated_by_tokens(ranked_tags, files, max_tokens)
+        self._render_cache.clear()
+        self._tree_context_cache.clear()
+        try:
+            tree = self._to_tree_truncated_by_tokens(ranked_tags, files, max_tokens)
+        finally:
+            self._render_cache.clear()
+            self._tree_context_cache.clear()
 
         return tree, report
 
@@ -1127,18 +1826,23 @@ class SimpleRepoMap:
             chat_fnames={source_file_str} if source_file_str else None,
             mentioned_idents={symbol},
             kinds={"def", "ref"},
+            names={symbol},
         )
 
-        # 4. Filtrar pelo símbolo (já vem ordenado por rank)
-        matching = [(rank, tag) for rank, tag in ranked_tags if tag.name == symbol]
-        definitions = [tag for rank, tag in matching if tag.kind == "def"]
-        references = [tag for rank, tag in matching if tag.kind == "ref"]
+        # 4. Separar por tipo (só tags do símbolo, já ordenadas por rank)
+        definitions = [tag for rank, tag in ranked_tags if tag.kind == "def"]
+        references = [tag for rank, tag in ranked_tags if tag.kind == "ref"]
 
         # 5. Helper para criar SymbolLocation
+        # (linhas de cada arquivo são divididas uma única vez e reutilizadas)
+        lines_by_file: Dict[str, List[str]] = {}
+
         def make_location(tag: Tag) -> SymbolLocation:
             snippet = ""
             if include_snippet and tag.rel_fname in files:
-                lines = files[tag.rel_fname].splitlines()
+                lines = lines_by_file.get(tag.rel_fname)
+                if lines is None:
+                    lines = lines_by_file[tag.rel_fname] = files[tag.rel_fname].splitlines()
                 if 0 < tag.line <= len(lines):
                     snippet = lines[tag.line - 1].strip()
             return SymbolLocation(
@@ -1247,13 +1951,19 @@ class SimpleRepoMap:
             chat_fnames={source_file_str} if source_file_str else None,
             mentioned_idents=set(symbols),  # Todos recebem boost 10x
             kinds={"def", "ref"},
+            names=set(symbols),
         )
 
         # 4. Helper para criar SymbolLocation
+        # (linhas de cada arquivo são divididas uma única vez e reutilizadas)
+        lines_by_file: Dict[str, List[str]] = {}
+
         def make_location(tag: Tag) -> SymbolLocation:
             snippet = ""
             if include_snippet and tag.rel_fname in files:
-                lines_list = files[tag.rel_fname].splitlines()
+                lines_list = lines_by_file.get(tag.rel_fname)
+                if lines_list is None:
+                    lines_list = lines_by_file[tag.rel_fname] = files[tag.rel_fname].splitlines()
                 if 0 < tag.line <= len(lines_list):
                     snippet = lines_list[tag.line - 1].strip()
             return SymbolLocation(
@@ -1262,11 +1972,8 @@ class SimpleRepoMap:
                 snippet=snippet,
             )
 
-        # 5. Filtrar e agrupar por símbolo
-        symbol_set = set(symbols)
-        matching = [(rank, tag) for rank, tag in ranked_tags if tag.name in symbol_set]
-
-        # Agrupar por símbolo
+        # 5. Agrupar por símbolo (ranked_tags já só contém os símbolos buscados)
+        matching = ranked_tags
         defs_by_symbol: Dict[str, List[Tag]] = defaultdict(list)
         refs_by_symbol: Dict[str, List[Tag]] = defaultdict(list)
 
@@ -1308,56 +2015,75 @@ class SimpleRepoMap:
     # Métodos Privados - Resolução de Paths
     # =========================================================================
 
-    def _should_exclude(self, path: Path, excludes: Set[str]) -> bool:
+    def _should_exclude(
+        self,
+        path: Path,
+        excludes: FrozenSet[str],
+        excludes_re: Optional[re.Pattern] = None,
+    ) -> bool:
         """
         Verifica se um caminho deve ser excluído.
 
         Args:
             path: Caminho a verificar
-            excludes: Conjunto de padrões de exclusão
+            excludes: Nomes excluídos, comparados literalmente (já
+                incluindo os literais de DEFAULT_EXCLUDES)
+            excludes_re: Padrões com wildcard (ex: *.egg-info), padrão e
+                adicionais, compilados numa única regex por _compile_globs
 
         Returns:
             True se deve ser excluído
         """
         # Verificar cada parte do caminho
-        for part in path.parts:
-            if part in excludes:
-                return True
-            # Verificar padrões com wildcard (ex: *.egg-info)
-            for pattern in excludes:
-                if '*' in pattern:
-                    import fnmatch
-                    if fnmatch.fnmatch(part, pattern):
-                        return True
-        return False
+        return any(
+            self._is_excluded_name(part, excludes, excludes_re) for part in path.parts
+        )
+
+    @staticmethod
+    def _is_excluded_name(
+        name: str,
+        excludes: FrozenSet[str],
+        excludes_re: Optional[re.Pattern] = None,
+    ) -> bool:
+        """Verifica um único nome de arquivo/diretório (ver _should_exclude)."""
+        return name in excludes or (
+            excludes_re is not None and excludes_re.match(name) is not None
+        )
 
     def _is_supported_file(self, path: Path) -> bool:
         """Verifica se o arquivo tem extensão suportada pelo Tree-sitter."""
-        ext = path.suffix.lower()
-        return ext in EXTENSION_TO_LANG
+        return get_lang_from_filename(path.name) is not None
 
     def _resolve_paths(
         self,
         paths: List[Path],
         excludes: Optional[Set[str]] = None,
-    ) -> List[Path]:
+    ) -> List[Tuple[str, str]]:
         """
         Resolve lista de paths em arquivos concretos.
 
         Aceita tanto arquivos quanto diretórios. Diretórios são
-        escaneados recursivamente.
+        escaneados recursivamente. Cada arquivo sai como o par de strings
+        (caminho_absoluto, caminho_relativo) — a varredura já conhece os
+        dois, então nem ela nem _read_files criam um Path por arquivo.
 
         Args:
             paths: Lista de arquivos e/ou diretórios
             excludes: Padrões de exclusão adicionais
 
         Returns:
-            Lista de arquivos descobertos
+            Lista de pares (caminho_absoluto, caminho_relativo) descobertos
         """
-        # Combinar exclusões padrão com adicionais
-        all_excludes = DEFAULT_EXCLUDES.copy()
-        if excludes:
-            all_excludes.update(excludes)
+        # Exclusões padrão e adicionais juntas: um único frozenset de nomes
+        # literais e uma única regex com todos os wildcards, montados uma vez
+        # por chamada; cada nome visitado custa um lookup e no máximo um match
+        extra = frozenset(excludes) if excludes else frozenset()
+        extra_globs = {p for p in extra if '*' in p}
+        all_excludes = _EXCLUDE_LITERALS | (extra - extra_globs)
+        if extra_globs:
+            excludes_re = _compile_globs(sorted(extra_globs.union(_EXCLUDE_GLOBS)))
+        else:
+            excludes_re = _EXCLUDE_GLOB_RE
 
         discovered = []
 
@@ -1373,84 +2099,223 @@ class SimpleRepoMap:
                     except ValueError:
                         rel_path = Path(path.name)
 
-                    if not self._should_exclude(rel_path, all_excludes):
-                        discovered.append(path)
+                    if not self._should_exclude(rel_path, all_excludes, excludes_re):
+                        discovered.append((str(path), str(rel_path)))
                         self._log(f"Arquivo: {path}")
 
             elif path.is_dir():
                 # Diretório - escanear recursivamente
                 self._log(f"Escaneando diretório: {path}")
 
-                for file_path in path.rglob('*'):
-                    if file_path.is_dir():
-                        continue
-
-                    # Calcular caminho relativo para verificar exclusões
-                    try:
-                        rel_path = file_path.relative_to(self.root)
-                    except ValueError:
-                        try:
-                            rel_path = file_path.relative_to(path)
-                        except ValueError:
-                            rel_path = Path(file_path.name)
-
-                    # Verificar exclusões
-                    if self._should_exclude(rel_path, all_excludes):
-                        continue
-
+                # Partes do caminho acima do diretório (relativas à raiz)
+                # são verificadas uma vez; abaixo dele, cada nome é
+                # verificado durante a varredura e diretórios excluídos
+                # nem são listados
+                try:
+                    base_rel = path.relative_to(self.root)
+                except ValueError:
+                    base_rel = None
+                if base_rel is not None and self._should_exclude(
+                    base_rel, all_excludes, excludes_re
+                ):
+                    continue
+
+                def skip(name: str) -> bool:
+                    return self._is_excluded_name(name, all_excludes, excludes_re)
+
+                # Dentro da raiz o caminho relativo é só uma fatia do
+                # absoluto; fora dela vale o nome do arquivo
+                root_str = os.fspath(self.root)
+                prefix_len = len(root_str.rstrip(os.sep)) + 1
+
+                for abs_str, name in self._walk_directory(path, skip):
                     # Verificar se é arquivo suportado
-                    if not self._is_supported_file(file_path):
+                    if get_lang_from_filename(name) is None:
                         continue
 
-                    discovered.append(file_path)
+                    rel_str = abs_str[prefix_len:] if base_rel is not None else name
+                    discovered.append((abs_str, rel_str))
 
         self._log(f"Total: {len(discovered)} arquivos descobertos")
         return discovered
 
-    def _read_files(self, file_paths: List[Path]) -> Dict[str, str]:
+    def _walk_directory(
+        self,
+        directory: Path,
+        skip: Optional[Callable[[str], bool]] = None,
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Lista os arquivos sob `directory` recursivamente com os.scandir.
+
+        Mesma ordem e semântica do rglob('*') usado antes: os arquivos de um
+        diretório saem quando o pai é visitado (em pré-ordem), e links
+        simbólicos para arquivos entram, para diretórios não. O tipo de cada
+        entrada vem do próprio readdir, sem um stat por arquivo, e cada
+        diretório é listado uma única vez.
+
+        Args:
+            directory: Diretório a percorrer
+            skip: Predicado sobre o nome da entrada; arquivos e diretórios
+                para os quais retorna True são ignorados (diretórios sem
+                sequer serem listados)
+
+        Yields:
+            Pares (caminho_absoluto, nome) de cada arquivo
+        """
+        def listing(path: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+            files, subdirs = [], []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if skip is not None and skip(entry.name):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif not (entry.is_symlink() and entry.is_dir()):
+                            files.append((entry.path, entry.name))
+            except OSError:
+                # Diretório removido ou sem permissão durante a varredura
+                pass
+            return files, subdirs
+
+        files, subdirs = listing(os.fspath(directory))
+        yield from files
+
+        pending = [subdirs]
+        while pending:
+            children = []
+            for subdir in pending.pop():
+                files, grandchildren = listing(subdir)
+                yield from files
+                children.append(grandchildren)
+            # Empilhar ao contrário para visitar o primeiro subdiretório antes
+            pending.extend(reversed(children))
+
+    def _read_files(
+        self,
+        file_paths: List[Tuple[str, str]],
+        excluded: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, str]:
         """
         Lê conteúdo de uma lista de arquivos.
 
+        Arquivos maiores que `max_file_bytes` são ignorados sem serem lidos
+        por inteiro, e binários (byte nulo nos primeiros _BINARY_SNIFF_BYTES)
+        sem serem decodificados. A partir de _PARALLEL_READ_MIN_FILES
+        arquivos (e com mais de um núcleo) a leitura é feita num
+        ThreadPoolExecutor, já que o GIL é liberado durante o I/O; com um
+        núcleo só e arquivos no page cache as threads só somam overhead. As mensagens de log são emitidas
+        depois, na thread principal e na ordem dos arquivos.
+
         Args:
-            file_paths: Lista de caminhos de arquivos
+            file_paths: Pares (caminho_absoluto, caminho_relativo) vindos
+                de _resolve_paths
+            excluded: Se informado, recebe {caminho_relativo: motivo} dos
+                arquivos ignorados por tamanho ou por serem binários
 
         Returns:
             Dicionário {caminho_relativo: conteúdo}
         """
+        cpus = os.cpu_count() or 1
+        if len(file_paths) < _PARALLEL_READ_MIN_FILES or cpus <= 1:
+            results = list(map(self._read_one, file_paths))
+        else:
+            workers = min(_MAX_READ_WORKERS, cpus * 4, len(file_paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._read_one, file_paths))
+
         files = {}
         errors = []
-
-        for fpath in file_paths:
-            abs_path = fpath.resolve() if not fpath.is_absolute() else fpath
-
-            # Calcular caminho relativo
-            try:
-                rel_path = abs_path.relative_to(self.root)
-            except ValueError:
-                rel_path = Path(abs_path.name)
-
-            # Ler conteúdo
-            try:
-                content = abs_path.read_text(encoding='utf-8')
-                files[str(rel_path)] = content
-            except UnicodeDecodeError:
-                # Tentar com latin-1 como fallback
-                try:
-                    content = abs_path.read_text(encoding='latin-1')
-                    files[str(rel_path)] = content
-                    self._log(f"Arquivo {rel_path} lido com encoding latin-1")
-                except Exception as e:
-                    errors.append((rel_path, str(e)))
-                    self._log(f"Erro ao ler {rel_path}: {e}")
-            except Exception as e:
-                errors.append((rel_path, str(e)))
-                self._log(f"Erro ao ler {rel_path}: {e}")
+        for rel_path, content, skip_reason, message in results:
+            if message:
+                self._log(message)
+            if content is not None:
+                files[rel_path] = content
+            elif skip_reason is not None:
+                if excluded is not None:
+                    excluded[rel_path] = skip_reason
+            else:
+                errors.append((rel_path, message))
 
         if errors:
             self._log(f"{len(errors)} arquivos não puderam ser lidos")
 
         return files
 
+    def _read_one(
+        self, fpath: Tuple[str, str]
+    ) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+        """
+        Lê um arquivo para _read_files (pode rodar em qualquer thread).
+
+        Returns:
+            Tupla (caminho_relativo, conteúdo, motivo_para_ignorar, mensagem
+            de log). Conteúdo None indica arquivo ignorado (com motivo) ou
+            erro de leitura (sem motivo)
+        """
+        abs_path, rel_path = fpath
+
+        # Ler o arquivo uma única vez; o fallback para latin-1 decodifica
+        # os mesmos bytes em vez de reler o disco. Sem buffer (FileIO
+        # direto): o conteúdo é lido numa só chamada, então o BufferedReader
+        # só adicionaria uma cópia
+        limit = self.max_file_bytes
+        content = message = None
+        try:
+            with open(abs_path, 'rb', buffering=0) as f:
+                # Ler no máximo limit + 1 bytes basta para saber se o arquivo
+                # passa do limite, sem stat extra; acima de _MMAP_MIN_BYTES
+                # o arquivo é mapeado em vez de copiado para um bytes
+                chunk = _MMAP_MIN_BYTES if limit is None else min(limit, _MMAP_MIN_BYTES)
+                data = f.read(chunk + 1)
+                # Byte nulo no início = binário; nem decodifica nem analisa
+                binary = data.find(b"\0", 0, _BINARY_SNIFF_BYTES) != -1
+                if binary:
+                    size = len(data)
+                elif len(data) > chunk and (limit is None or limit > chunk):
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        data = None
+                        if limit is None or len(mm) <= limit:
+                            content, message = self._decode(mm, rel_path)
+                        size = len(mm)
+                else:
+                    size = len(data)
+        except Exception as e:
+            return rel_path, None, None, f"Erro ao ler {rel_path}: {e}"
+
+        if limit is not None and size > limit:
+            return (
+                rel_path, None, f"maior que {limit} bytes",
+                f"Arquivo {rel_path} ignorado: maior que {limit} bytes",
+            )
+
+        if binary:
+            return (
+                rel_path, None, "arquivo binário",
+                f"Arquivo {rel_path} ignorado: arquivo binário",
+            )
+
+        if content is None:
+            content, message = self._decode(data, rel_path)
+
+        # Mesma normalização de quebras de linha que read_text faria
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return rel_path, content, None, message
+
+    @staticmethod
+    def _decode(data, rel_path: str) -> Tuple[str, Optional[str]]:
+        """
+        Decodifica bytes (ou mmap) como utf-8, com fallback para latin-1.
+
+        Returns:
+            Tupla (conteúdo, mensagem de log ou None)
+        """
+        try:
+            return str(data, 'utf-8'), None
+        except UnicodeDecodeError:
+            return str(data, 'latin-1'), f"Arquivo {rel_path} lido com encoding latin-1"
+
 
 # =============================================================================
 # Exemplo de uso
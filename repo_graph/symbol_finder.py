@@ -1,8 +1,18 @@
-from dataclasses import dataclass
+import hashlib
+import os
+import marshal
+import sqlite3
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from os import PathLike
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 
-from tree_sitter import Language, Parser, Query, QueryCursor  # type: ignore
+from tree_sitter import Language, Parser, Query, QueryCursor, Tree  # type: ignore
 import tree_sitter_python as tspython
 
 
@@ -35,35 +45,48 @@ class SymbolUsages:
     definition_location: Optional[SymbolLocation]
     references: List[SymbolReference]
 
+    # Índices de references por caminho completo, (pasta, nome) e nome,
+    # construídos no primeiro find_references_of
+    _by_full: Optional[Dict[Path, List[SymbolReference]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _by_parent_name: Optional[Dict[Tuple[str, str], List[SymbolReference]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _by_name: Optional[Dict[str, List[SymbolReference]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def _build_index(self):
+        """Agrupa as referências pelas três chaves de find_references_of."""
+        by_full = defaultdict(list)
+        by_parent_name = defaultdict(list)
+        by_name = defaultdict(list)
+        for ref in self.references:
+            path = ref.location.file_path
+            by_full[path].append(ref)
+            by_parent_name[(path.parent.name, path.name)].append(ref)
+            by_name[path.name].append(ref)
+        self._by_full = dict(by_full)
+        self._by_parent_name = dict(by_parent_name)
+        self._by_name = dict(by_name)
+
     def find_references_of(self, file_path: str | Path) -> List[SymbolReference]:
         if not self.references:
             return []
 
         file_path = Path(file_path)
-
-        # Try to find references by the exact file path
-        found_references = [
-            ref for ref in self.references
-            if ref.location.file_path == file_path
-        ]
-        if found_references:
-            return found_references
-
-        # Try to find references by parent and file name
-        found_references = [
-            ref for ref in self.references
-            if ref.location.file_path.parent.name == file_path.parent.name
-               and ref.location.file_path.name == file_path.name
-        ]
-        if found_references:
-            return found_references
-
-        # Otherwise, try to find references by file name only
-        found_references = [
-            ref for ref in self.references
-            if ref.location.file_path.name == file_path.name
-        ]
-        return found_references
+        if self._by_full is None:
+            self._build_index()
+
+        # Try to find references by the exact file path, then by parent and
+        # file name, and otherwise by file name only
+        found_references = (
+            self._by_full.get(file_path)
+            or self._by_parent_name.get((file_path.parent.name, file_path.name))
+            or self._by_name.get(file_path.name, [])
+        )
+        return list(found_references)
 
 
 
@@ -82,6 +105,149 @@ class SymbolUsages:
             print(f"    {loc.context_line}")
 
 
+# Quantidade mínima de arquivos dependentes para buscar referências num
+# ProcessPoolExecutor; abaixo disso subir os processos não compensa
+_PARALLEL_REFS_MIN_FILES = 32
+
+# Árvores mantidas por SymbolFinder entre buscas (LRU), para que vários
+# símbolos consultados nos mesmos arquivos não os reparseiem
+_TREE_CACHE_SIZE = 256
+
+
+# ------------------------------------------------------------
+# Language e queries compiladas (compartilhadas entre instâncias)
+# ------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _get_language() -> Language:
+    """Retorna a Language Python do Tree-sitter, criada uma única vez."""
+    return Language(tspython.language())
+
+
+@lru_cache(maxsize=None)
+def _compile_query(query_str: str) -> Query:
+    """
+    Compila a query Tree-sitter uma única vez por texto.
+
+    As queries do SymbolFinder são literais fixos, então o cache é pequeno
+    e evita recompilar a mesma query para cada arquivo analisado (e para
+    cada novo SymbolFinder, criado a cada find_symbol_references).
+    """
+    return Query(_get_language(), query_str)
+
+
+# ------------------------------------------------------------
+# Cache em disco das capturas das queries
+# ------------------------------------------------------------
+
+# Nome do arquivo SQLite do cache; a versão muda quando o formato das
+# capturas mudar, invalidando caches antigos
+_CAPTURES_CACHE_FILE = "symbol_captures.v2.sqlite"
+
+# Nó capturado por uma query, com os campos usados pelo SymbolFinder.
+# As bindings do Tree-sitter não serializam árvores, então o cache guarda
+# as capturas de cada query em vez da árvore, como tuplas simples em
+# marshal: ao contrário de pickle, ler o cache não executa código
+_CapturedNode = namedtuple("_CapturedNode", "start_byte end_byte start_point end_point")
+
+
+def _open_captures_cache(cache_dir: Path) -> sqlite3.Connection:
+    """Abre (criando se preciso) o banco SQLite do cache de capturas."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(cache_dir / _CAPTURES_CACHE_FILE))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS captures ("
+        "fname TEXT PRIMARY KEY, digest BLOB NOT NULL, captures BLOB NOT NULL)"
+    )
+    return conn
+
+
+def _code_digest(code: bytes) -> bytes:
+    """Hash do conteúdo do arquivo, usado para validar entradas do cache."""
+    return hashlib.blake2b(code, digest_size=16).digest()
+
+
+def _to_captured_nodes(matches: list) -> list:
+    """Converte matches em tuplas simples (formato do cache) para _CapturedNode."""
+    make_node = _CapturedNode._make
+    return [
+        (pattern_index, {name: [make_node(node) for node in nodes] for name, nodes in captures.items()})
+        for pattern_index, captures in matches
+    ]
+
+
+class _FileQueries:
+    """
+    Executa as queries do SymbolFinder sobre um arquivo.
+
+    Sem cache em disco (`stored` None) as queries rodam direto na árvore.
+    Com cache, `stored` traz as capturas serializadas de cada query já
+    executada sobre o mesmo conteúdo, desserializadas só quando a query é
+    usada; o arquivo só é parseado se alguma query ainda não estiver no
+    cache, e as capturas novas entram em `stored` para gravação.
+    """
+
+    def __init__(
+        self,
+        code: bytes,
+        parse: Callable[[], Tree],
+        stored: Optional[Dict[str, bytes]] = None,
+    ):
+        self.code = code
+        self.stored = stored
+        self.dirty = False
+        self._parse = parse
+        self._root_node = None
+        self._loaded: Dict[str, list] = {}
+
+    def _get_root_node(self):
+        if self._root_node is None:
+            self._root_node = self._parse().root_node
+        return self._root_node
+
+    def matches(self, query_str: str):
+        if self.stored is None:
+            cursor = QueryCursor(_compile_query(query_str))
+            return cursor.matches(self._get_root_node())
+
+        found = self._loaded.get(query_str)
+        if found is not None:
+            return found
+
+        data = self.stored.get(query_str)
+        if data is not None:
+            try:
+                found = _to_captured_nodes(marshal.loads(data))
+            except (EOFError, ValueError, TypeError):
+                # Entrada corrompida ou em outro formato: executar de novo
+                found = None
+
+        if found is None:
+            cursor = QueryCursor(_compile_query(query_str))
+            plain = [
+                (pattern_index, {
+                    name: [
+                        (
+                            node.start_byte,
+                            node.end_byte,
+                            tuple(node.start_point),
+                            tuple(node.end_point),
+                        )
+                        for node in nodes
+                    ]
+                    for name, nodes in captures.items()
+                })
+                for pattern_index, captures in cursor.matches(self._get_root_node())
+            ]
+            self.stored[query_str] = marshal.dumps(plain)
+            self.dirty = True
+            found = _to_captured_nodes(plain)
+
+        self._loaded[query_str] = found
+        return found
+
+
 # ------------------------------------------------------------
 # SymbolFinder - Classe dedicada à busca de símbolos
 # ------------------------------------------------------------
@@ -89,14 +255,29 @@ class SymbolUsages:
 class SymbolFinder:
     """Classe dedicada à busca de símbolos usando Tree-sitter."""
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str | PathLike[str]] = None):
+        """
+        Args:
+            cache_dir: Diretório do cache em disco (SQLite) das capturas das
+                queries por arquivo, reaproveitado entre execuções. None
+                (default) desativa o cache
+        """
         self._parser = None  # lazy init
         self._language = None
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        # file_path -> (st_mtime_ns, code, tree); dict em ordem de uso (LRU)
+        self._tree_cache: Dict[Path, Tuple[int, bytes, Tree]] = {}
+        # (code, linhas decodificadas) do último arquivo em _get_context_line
+        self._context_lines: Optional[Tuple[bytes, List[str]]] = None
+        # Conexão do cache em disco e arquivos abertos durante find_references
+        self._cache_conn: Optional[sqlite3.Connection] = None
+        # (fname -> (digest, _FileQueries))
+        self._opened: Dict[str, Tuple[bytes, _FileQueries]] = {}
 
     def _get_parser(self) -> Parser:
         """Cria parser Tree-sitter (lazy init)."""
         if self._parser is None:
-            self._language = Language(tspython.language())
+            self._language = _get_language()
             self._parser = Parser(self._language)
         return self._parser
 
@@ -148,22 +329,155 @@ class SymbolFinder:
     def _read_file(self, file_path: Path) -> Optional[bytes]:
         """Lê arquivo como bytes."""
         try:
-            return file_path.read_bytes()
+            # Sem buffer: uma leitura do arquivo inteiro não ganha nada com o
+            # BufferedReader, que só acrescentaria alocação e cópia
+            with open(file_path, 'rb', buffering=0) as f:
+                return f.read()
         except Exception:
             return None
 
+    def _parse_file(self, file_path: Path) -> Optional[Tuple[bytes, Tree]]:
+        """
+        Lê e parseia o arquivo, reaproveitando a árvore de buscas anteriores.
+
+        A entrada do cache é validada pelo st_mtime_ns do arquivo, então uma
+        edição entre duas buscas provoca um novo parse.
+        """
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except Exception:
+            return None
+
+        cached = self._tree_cache.pop(file_path, None)
+        if cached is not None and cached[0] == mtime_ns:
+            self._tree_cache[file_path] = cached  # mais recente
+            return cached[1], cached[2]
+
+        code = self._read_file(file_path)
+        if code is None:
+            return None
+
+        tree = self._get_parser().parse(code)
+        self._tree_cache[file_path] = (mtime_ns, code, tree)
+        if len(self._tree_cache) > _TREE_CACHE_SIZE:
+            # Descartar o menos recente (dict mantém ordem de inserção)
+            del self._tree_cache[next(iter(self._tree_cache))]
+        return code, tree
+
+    def _tree_for(self, file_path: Path, code: bytes) -> Tree:
+        """
+        Árvore de `code` via _parse_file, reaproveitando o cache de árvores.
+
+        Se o arquivo mudou depois da leitura de `code`, parseia o conteúdo
+        já lido para manter as capturas coerentes com ele.
+        """
+        parsed = self._parse_file(file_path)
+        if parsed is not None and parsed[0] == code:
+            return parsed[1]
+        return self._get_parser().parse(code)
+
     def _get_context_line(self, code: bytes, line_num: int) -> str:
         """Retorna a linha de código (0-based line_num)."""
-        lines = code.decode("utf-8", errors="replace").split("\n")
+        # As referências de um arquivo são buscadas em sequência, então
+        # guardar as linhas do último arquivo evita decodificá-lo e
+        # dividi-lo de novo a cada referência encontrada
+        cached = self._context_lines
+        if cached is not None and cached[0] is code:
+            lines = cached[1]
+        else:
+            lines = code.decode("utf-8", errors="replace").split("\n")
+            self._context_lines = (code, lines)
         if 0 <= line_num < len(lines):
             return lines[line_num].strip()
         return ""
 
-    def _run_query(self, query_str: str, root_node):
+    def _open_file(self, file_path: Path) -> Optional[_FileQueries]:
+        """
+        Abre o arquivo para execução de queries.
+
+        Sem cache em disco, usa a árvore de _parse_file. Com cache, lê só o
+        conteúdo e carrega as capturas já gravadas para ele; o parse fica
+        para a primeira query ausente do cache.
+        """
+        if self._cache_conn is None:
+            parsed = self._parse_file(file_path)
+            if parsed is None:
+                return None
+            code, tree = parsed
+            return _FileQueries(code, lambda: tree)
+
+        code = self._read_file(file_path)
+        if code is None:
+            return None
+
+        fname = str(file_path)
+        digest = _code_digest(code)
+        opened = self._opened.get(fname)
+        if opened is not None and opened[0] == digest:
+            # Mesmo arquivo já aberto nesta busca (ex: definição e dependente)
+            return opened[1]
+
+        stored = {}
+        try:
+            row = self._cache_conn.execute(
+                "SELECT digest, captures FROM captures WHERE fname = ?", (fname,)
+            ).fetchone()
+            if row is not None and row[0] == digest:
+                loaded = marshal.loads(row[1])
+                if isinstance(loaded, dict):
+                    stored = loaded
+        except (sqlite3.Error, EOFError, ValueError, TypeError):
+            pass
+
+        source = _FileQueries(code, lambda: self._tree_for(file_path, code), stored)
+        self._opened[fname] = (digest, source)
+        return source
+
+    @contextmanager
+    def _captures_cache(self) -> Iterator[None]:
+        """
+        Mantém o cache em disco aberto durante uma busca (se configurado).
+
+        No final, grava as capturas novas dos arquivos abertos. Erros do
+        cache não interrompem a busca: sem cache, as queries rodam direto.
+        """
+        if self.cache_dir is None:
+            yield
+            return
+
+        try:
+            self._cache_conn = _open_captures_cache(self.cache_dir)
+        except (OSError, sqlite3.Error):
+            self._cache_conn = None
+
+        try:
+            yield
+            if self._cache_conn is not None:
+                try:
+                    with self._cache_conn:
+                        self._cache_conn.executemany(
+                            "INSERT OR REPLACE INTO captures (fname, digest, captures) VALUES (?, ?, ?)",
+                            [
+                                (
+                                    fname,
+                                    digest,
+                                    marshal.dumps(source.stored),
+                                )
+                                for fname, (digest, source) in self._opened.items()
+                                if source.dirty
+                            ],
+                        )
+                except sqlite3.Error:
+                    pass
+        finally:
+            if self._cache_conn is not None:
+                self._cache_conn.close()
+            self._cache_conn = None
+            self._opened = {}
+
+    def _run_query(self, query_str: str, source: _FileQueries):
         """Executa uma query Tree-sitter e retorna os matches."""
-        query = Query(self._language, query_str)
-        cursor = QueryCursor(query)
-        return cursor.matches(root_node)
+        return source.matches(query_str)
 
     def _find_function_definition(
         self,
@@ -171,12 +485,10 @@ class SymbolFinder:
         function_name: str
     ) -> Optional[SymbolLocation]:
         """Encontra onde uma função é definida."""
-        code = self._read_file(file_path)
-        if code is None:
+        source = self._open_file(file_path)
+        if source is None:
             return None
-
-        parser = self._get_parser()
-        tree = parser.parse(code)
+        code = source.code
 
         # Query para encontrar definição de função
         query_str = """
@@ -184,7 +496,7 @@ class SymbolFinder:
                 name: (identifier) @func.name)
         """
 
-        for pattern_index, captures in self._run_query(query_str, tree.root_node):
+        for pattern_index, captures in self._run_query(query_str, source):
             for node in captures.get("func.name", []):
                 name = code[node.start_byte:node.end_byte].decode("utf-8")
                 if name == function_name:
@@ -205,12 +517,10 @@ class SymbolFinder:
         attr_name: Optional[str]
     ) -> Optional[SymbolLocation]:
         """Encontra onde o símbolo é definido."""
-        code = self._read_file(file_path)
-        if code is None:
+        source = self._open_file(file_path)
+        if source is None:
             return None
-
-        parser = self._get_parser()
-        tree = parser.parse(code)
+        code = source.code
 
         # Query para encontrar definição de classe
         query_str = """
@@ -218,7 +528,7 @@ class SymbolFinder:
                 name: (identifier) @class.name)
         """
 
-        for pattern_index, captures in self._run_query(query_str, tree.root_node):
+        for pattern_index, captures in self._run_query(query_str, source):
             for node in captures.get("class.name", []):
                 name = code[node.start_byte:node.end_byte].decode("utf-8")
                 if name == class_name:
@@ -234,14 +544,14 @@ class SymbolFinder:
                     else:
                         # Buscando atributo da classe - encontrar no body
                         return self._find_attribute_definition(
-                            tree.root_node, code, file_path, class_name, attr_name
+                            source, code, file_path, class_name, attr_name
                         )
 
         return None
 
     def _find_attribute_definition(
         self,
-        root_node,
+        source: _FileQueries,
         code: bytes,
         file_path: Path,
         class_name: str,
@@ -258,7 +568,7 @@ class SymbolFinder:
                             left: (identifier) @attr.name))))
         """
 
-        for pattern_index, captures in self._run_query(query_str, root_node):
+        for pattern_index, captures in self._run_query(query_str, source):
             class_nodes = captures.get("class.name", [])
             attr_nodes = captures.get("attr.name", [])
 
@@ -280,41 +590,34 @@ class SymbolFinder:
 
     def _find_typed_variables(
         self,
-        root_node,
+        source: _FileQueries,
         code: bytes,
         class_name: str
     ) -> List[str]:
         """Encontra nomes de variáveis que são do tipo da classe."""
         var_names = []
+        seen = set()
 
-        # Query para instanciações: user = User(...)
-        instantiation_query = """
+        # Uma única query (um só percurso da árvore) com três padrões:
+        # instanciações: user = User(...)
+        # type hints: user: User = ...
+        # parâmetros tipados: def foo(user: User):
+        query_str = """
             (assignment
                 left: (identifier) @var.name
                 right: (call
-                    function: (identifier) @class.name))
-        """
-
-        for pattern_index, captures in self._run_query(instantiation_query, root_node):
-            var_nodes = captures.get("var.name", [])
-            class_nodes = captures.get("class.name", [])
+                    function: (identifier) @type.name))
 
-            for class_node in class_nodes:
-                cname = code[class_node.start_byte:class_node.end_byte].decode("utf-8")
-                if cname == class_name:
-                    for var_node in var_nodes:
-                        vname = code[var_node.start_byte:var_node.end_byte].decode("utf-8")
-                        if vname not in var_names:
-                            var_names.append(vname)
-
-        # Query para type hints: user: User = ...
-        typehint_query = """
             (assignment
                 left: (identifier) @var.name
                 type: (type (identifier) @type.name))
+
+            (typed_parameter
+                (identifier) @var.name
+                type: (type (identifier) @type.name))
         """
 
-        for pattern_index, captures in self._run_query(typehint_query, root_node):
+        for pattern_index, captures in self._run_query(query_str, source):
             var_nodes = captures.get("var.name", [])
             type_nodes = captures.get("type.name", [])
 
@@ -323,36 +626,18 @@ class SymbolFinder:
                 if tname == class_name:
                     for var_node in var_nodes:
                         vname = code[var_node.start_byte:var_node.end_byte].decode("utf-8")
-                        if vname not in var_names:
+                        if vname not in seen:
+                            seen.add(vname)
                             var_names.append(vname)
 
-        # Query para parâmetros tipados: def foo(user: User):
-        param_query = """
-            (typed_parameter
-                (identifier) @param.name
-                type: (type (identifier) @param.type))
-        """
-
-        for pattern_index, captures in self._run_query(param_query, root_node):
-            param_nodes = captures.get("param.name", [])
-            type_nodes = captures.get("param.type", [])
-
-            for type_node in type_nodes:
-                tname = code[type_node.start_byte:type_node.end_byte].decode("utf-8")
-                if tname == class_name:
-                    for param_node in param_nodes:
-                        pname = code[param_node.start_byte:param_node.end_byte].decode("utf-8")
-                        if pname not in var_names:
-                            var_names.append(pname)
-
         return var_names
 
     def _find_attribute_accesses(
         self,
-        root_node,
+        source: _FileQueries,
         code: bytes,
         file_path: Path,
-        var_names: List[str],
+        var_names: Set[str],
         attr_name: str,
         qualified_name: str
     ) -> List[SymbolReference]:
@@ -366,7 +651,7 @@ class SymbolFinder:
                 attribute: (identifier) @attr.name)
         """
 
-        for match in self._run_query(query_str, root_node):
+        for match in self._run_query(query_str, source):
             captures = match[1]
             obj_nodes = captures.get("object.name", [])
             attr_nodes = captures.get("attr.name", [])
@@ -394,7 +679,7 @@ class SymbolFinder:
 
     def _find_class_references(
         self,
-        root_node,
+        source: _FileQueries,
         code: bytes,
         file_path: Path,
         class_name: str
@@ -408,7 +693,7 @@ class SymbolFinder:
                 function: (identifier) @class.name)
         """
 
-        for match in self._run_query(instantiation_query, root_node):
+        for match in self._run_query(instantiation_query, source):
             for node in match[1].get("class.name", []):
                 name = code[node.start_byte:node.end_byte].decode("utf-8")
                 if name == class_name:
@@ -430,7 +715,7 @@ class SymbolFinder:
             (type (identifier) @type.name)
         """
 
-        for match in self._run_query(type_query, root_node):
+        for match in self._run_query(type_query, source):
             for node in match[1].get("type.name", []):
                 name = code[node.start_byte:node.end_byte].decode("utf-8")
                 if name == class_name:
@@ -453,7 +738,7 @@ class SymbolFinder:
                 (dotted_name (identifier) @import.name))
         """
 
-        for match in self._run_query(import_query, root_node):
+        for match in self._run_query(import_query, source):
             for node in match[1].get("import.name", []):
                 name = code[node.start_byte:node.end_byte].decode("utf-8")
                 if name == class_name:
@@ -480,28 +765,25 @@ class SymbolFinder:
         qualified_name: str
     ) -> List[SymbolReference]:
         """Encontra referências ao símbolo em um arquivo."""
-        code = self._read_file(file_path)
-        if code is None:
+        source = self._open_file(file_path)
+        if source is None:
             return []
-
-        parser = self._get_parser()
-        tree = parser.parse(code)
-        root_node = tree.root_node
+        code = source.code
 
         references = []
 
         if attr_name:
             # Buscando atributo: encontrar variáveis tipadas e acessos
-            typed_vars = self._find_typed_variables(root_node, code, class_name)
+            typed_vars = set(self._find_typed_variables(source, code, class_name))
             # Adicionar a própria classe para acessos diretos como User.email
-            typed_vars.append(class_name)
+            typed_vars.add(class_name)
             attr_refs = self._find_attribute_accesses(
-                root_node, code, file_path, typed_vars, attr_name, qualified_name
+                source, code, file_path, typed_vars, attr_name, qualified_name
             )
             references.extend(attr_refs)
         else:
             # Buscando só a classe: encontrar instanciações, type hints, imports
-            class_refs = self._find_class_references(root_node, code, file_path, class_name)
+            class_refs = self._find_class_references(source, code, file_path, class_name)
             references.extend(class_refs)
 
         return references
@@ -528,20 +810,23 @@ class SymbolFinder:
         """
         symbol_type, name, attr_name = self._parse_qualified_name(qualified_name)
 
-        if symbol_type == "function":
-            # Buscar chamadas de função
-            definition = self._find_function_definition(definition_file, name)
-            references = []
-            for file_path in dependent_files:
-                refs = self._find_function_calls_in_file(file_path, name)
-                references.extend(refs)
-        else:
-            # Buscar referências de classe/atributo
-            definition = self._find_definition(definition_file, name, attr_name)
-            references = []
-            for file_path in dependent_files:
-                refs = self._find_references_in_file(file_path, name, attr_name, qualified_name)
-                references.extend(refs)
+        with self._captures_cache():
+            if symbol_type == "function":
+                # Buscar chamadas de função
+                definition = self._find_function_definition(definition_file, name)
+            else:
+                # Buscar referências de classe/atributo
+                definition = self._find_definition(definition_file, name, attr_name)
+
+            workers = min(os.cpu_count() or 1, len(dependent_files))
+            if len(dependent_files) < _PARALLEL_REFS_MIN_FILES or workers <= 1:
+                references = self._find_references_in_files(
+                    dependent_files, symbol_type, name, attr_name, qualified_name
+                )
+            else:
+                references = self._find_references_parallel(
+                    dependent_files, workers, symbol_type, name, attr_name, qualified_name
+                )
 
         return SymbolUsages(
             symbol_name=qualified_name,
@@ -549,6 +834,61 @@ class SymbolFinder:
             references=references
         )
 
+    def _find_references_in_files(
+        self,
+        files: List[Path],
+        symbol_type: str,
+        name: str,
+        attr_name: Optional[str],
+        qualified_name: str
+    ) -> List[SymbolReference]:
+        """Encontra as referências ao símbolo em cada arquivo, em ordem."""
+        references = []
+        for file_path in files:
+            if symbol_type == "function":
+                refs = self._find_function_calls_in_file(file_path, name)
+            else:
+                refs = self._find_references_in_file(file_path, name, attr_name, qualified_name)
+            references.extend(refs)
+        return references
+
+    def _find_references_parallel(
+        self,
+        files: List[Path],
+        workers: int,
+        symbol_type: str,
+        name: str,
+        attr_name: Optional[str],
+        qualified_name: str
+    ) -> List[SymbolReference]:
+        """
+        Busca referências num ProcessPoolExecutor, mantendo a ordem dos arquivos.
+
+        Parse e queries são CPU-bound e o laço sobre as capturas é bytecode
+        Python, então threads não escalariam. Os arquivos vão em lotes para
+        que cada worker abra o cache em disco uma vez por lote.
+        """
+        batch_size = max(1, len(files) // (4 * workers))
+        batches = [
+            (files[start:start + batch_size], symbol_type, name, attr_name, qualified_name)
+            for start in range(0, len(files), batch_size)
+        ]
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_refs_worker,
+                initargs=(self.cache_dir,),
+            ) as executor:
+                references = []
+                for refs in executor.map(_find_references_worker, batches):
+                    references.extend(refs)
+                return references
+        except (OSError, BrokenProcessPool):
+            # Ambientes sem suporte a multiprocessing: seguir sequencialmente
+            return self._find_references_in_files(
+                files, symbol_type, name, attr_name, qualified_name
+            )
+
     def _find_function_calls_in_file(
         self,
         file_path: Path,
@@ -560,13 +900,10 @@ class SymbolFinder:
         Captura tanto chamadas diretas (validate(...)) quanto
         chamadas de método (obj.validate(...)).
         """
-        code = self._read_file(file_path)
-        if code is None:
+        source = self._open_file(file_path)
+        if source is None:
             return []
-
-        parser = self._get_parser()
-        tree = parser.parse(code)
-        root_node = tree.root_node
+        code = source.code
 
         references = []
 
@@ -580,7 +917,7 @@ class SymbolFinder:
                 ]) @reference.call
         """
 
-        for match in self._run_query(query_str, root_node):
+        for match in self._run_query(query_str, source):
             captures = match[1]
             func_nodes = captures.get("func.name", [])
             call_nodes = captures.get("reference.call", [])
@@ -604,3 +941,25 @@ class SymbolFinder:
                     ))
 
         return references
+
+
+# ------------------------------------------------------------
+# Busca de referências em processos paralelos
+# ------------------------------------------------------------
+
+# Instância usada por cada processo worker (criada em _init_refs_worker)
+_worker_finder: Optional[SymbolFinder] = None
+
+
+def _init_refs_worker(cache_dir: Optional[Path]) -> None:
+    """Inicializa o SymbolFinder do processo worker."""
+    global _worker_finder
+    _worker_finder = SymbolFinder(cache_dir=cache_dir)
+
+
+def _find_references_worker(
+    batch: Tuple[List[Path], str, str, Optional[str], str]
+) -> List[SymbolReference]:
+    """Busca referências num lote (files, symbol_type, name, attr_name, qualified_name)."""
+    with _worker_finder._captures_cache():
+        return _worker_finder._find_references_in_files(*batch)
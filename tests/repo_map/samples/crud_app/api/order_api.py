@@ -1,12 +1,11 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Any, Dict, List, NamedTuple
 
 from ..service.order_service import OrderService
 from ..domain.entities import Order, OrderStatus
 
 
-@dataclass
-class OrderItemResponse:
+class OrderItemResponse(NamedTuple):
     product_id: int
     product_name: str
     quantity: int
@@ -14,8 +13,7 @@ class OrderItemResponse:
     total_price: str
 
 
-@dataclass
-class OrderResponse:
+class OrderResponse(NamedTuple):
     id: int
     user_id: int
     status: str
@@ -27,24 +25,45 @@ class OrderResponse:
     def from_entity(cls, order: Order) -> "OrderResponse":
         items = [
             OrderItemResponse(
-                product_id=item.product_id,
-                product_name=item.product_name,
-                quantity=item.quantity,
-                unit_price=str(item.unit_price),
-                total_price=str(item.total_price),
+                item.product_id,
+                item.product_name,
+                item.quantity,
+                str(item.unit_price),
+                str(item.total_price),
             )
             for item in order.items
         ]
         return cls(
-            id=order.id,
-            user_id=order.user_id,
-            status=order.status.value,
-            items=items,
-            total_amount=str(order.total_amount),
-            created_at=order.created_at.isoformat(),
+            order.id,
+            order.user_id,
+            order.status.value,
+            items,
+            str(order.total_amount),
+            order.created_at.isoformat(),
         )
 
 
+def _dump_order(order: Order) -> Dict[str, Any]:
+    total_amount = order.total_amount
+    return {
+        "id": order.id,
+        "user_id": order.user_id,
+        "status": order.status.value,
+        "items": [
+            {
+                "product_id": item.product_id,
+                "product_name": item.product_name,
+                "quantity": item.quantity,
+                "unit_price": str(item.unit_price),
+                "total_price": str(item.total_price),
+            }
+            for item in order.items
+        ],
+        "total_amount": str(total_amount),
+        "created_at": order.created_at.isoformat(),
+    }
+
+
 @dataclass
 class AddItemRequest:
     product_id: int
@@ -63,17 +82,17 @@ class OrderAPI:
         order = self.order_service.get_order_by_id(order_id)
         return OrderResponse.from_entity(order)
 
-    def list_orders(self, limit: int = 100, offset: int = 0) -> List[OrderResponse]:
+    def list_orders(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
         orders = self.order_service.list_orders(limit, offset)
-        return [OrderResponse.from_entity(o) for o in orders]
+        return [_dump_order(o) for o in orders]
 
-    def list_user_orders(self, user_id: int) -> List[OrderResponse]:
+    def list_user_orders(self, user_id: int) -> List[Dict[str, Any]]:
         orders = self.order_service.list_user_orders(user_id)
-        return [OrderResponse.from_entity(o) for o in orders]
+        return [_dump_order(o) for o in orders]
 
-    def list_pending_orders(self) -> List[OrderResponse]:
+    def list_pending_orders(self) -> List[Dict[str, Any]]:
         orders = self.order_service.list_orders_by_status(OrderStatus.PENDING)
-        return [OrderResponse.from_entity(o) for o in orders]
+        return [_dump_order(o) for o in orders]
 
     def add_item(self, order_id: int, request: AddItemRequest) -> OrderResponse:
         order = self.order_service.add_item_to_order(
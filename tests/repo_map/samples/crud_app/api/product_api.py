@@ -1,13 +1,12 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 from decimal import Decimal
 
 from ..service.product_service import ProductService
 from ..domain.entities import Product
 
 
-@dataclass
-class ProductResponse:
+class ProductResponse(NamedTuple):
     id: int
     name: str
     description: str
@@ -18,12 +17,12 @@ class ProductResponse:
     @classmethod
     def from_entity(cls, product: Product) -> "ProductResponse":
         return cls(
-            id=product.id,
-            name=product.name,
-            description=product.description,
-            price=str(product.price),
-            stock_quantity=product.stock_quantity,
-            is_available=product.is_available,
+            product.id,
+            product.name,
+            product.description,
+            str(product.price),
+            product.stock_quantity,
+            product.is_available,
         )
 
 
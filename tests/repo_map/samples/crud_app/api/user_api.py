@@ -1,12 +1,11 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 
 from ..service.user_service import UserService
 from ..domain.entities import User
 
 
-@dataclass
-class UserResponse:
+class UserResponse(NamedTuple):
     id: int
     name: str
     email: str
@@ -16,11 +15,11 @@ class UserResponse:
     @classmethod
     def from_entity(cls, user: User) -> "UserResponse":
         return cls(
-            id=user.id,
-            name=user.name,
-            email=user.email,
-            status=user.status.value,
-            created_at=user.created_at.isoformat(),
+            user.id,
+            user.name,
+            user.email,
+            user.status.value,
+            user.created_at.isoformat(),
         )
 
 
@@ -1,10 +1,13 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from enum import Enum
 
 
+_NO_ERRORS: Tuple[str, ...] = ()
+
+
 class UserStatus(Enum):
     ACTIVE = "active"
     INACTIVE = "inactive"
@@ -44,15 +47,19 @@ class User:
         self.status = UserStatus.BLOCKED
         self.updated_at = datetime.now()
 
-    def validate(self) -> List[str]:
-        errors = []
+    def validate(self) -> Sequence[str]:
+        errors = None
         if not self.name or len(self.name) < 2:
-            errors.append("Name must have at least 2 characters")
+            errors = ["Name must have at least 2 characters"]
         if not self.email or "@" not in self.email:
+            if errors is None:
+                errors = []
             errors.append("Invalid email format")
         if not self.password_hash:
+            if errors is None:
+                errors = []
             errors.append("Password is required")
-        return errors
+        return errors if errors is not None else _NO_ERRORS
 
 
 @dataclass
@@ -79,15 +86,19 @@ class Product:
         self.stock_quantity += quantity
         self.updated_at = datetime.now()
 
-    def validate(self) -> List[str]:
-        errors = []
+    def validate(self) -> Sequence[str]:
+        errors = None
         if not self.name or len(self.name) < 3:
-            errors.append("Product name must have at least 3 characters")
+            errors = ["Product name must have at least 3 characters"]
         if self.price <= 0:
+            if errors is None:
+                errors = []
             errors.append("Price must be greater than zero")
         if self.stock_quantity < 0:
+            if errors is None:
+                errors = []
             errors.append("Stock quantity cannot be negative")
-        return errors
+        return errors if errors is not None else _NO_ERRORS
 
 
 @dataclass
@@ -104,6 +115,21 @@ class OrderItem:
         return self.unit_price * self.quantity
 
 
+_ALLOWED_FROM = {
+    OrderStatus.CONFIRMED: frozenset({OrderStatus.PENDING}),
+    OrderStatus.SHIPPED: frozenset({OrderStatus.CONFIRMED}),
+    OrderStatus.DELIVERED: frozenset({OrderStatus.SHIPPED}),
+    OrderStatus.CANCELLED: frozenset({OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.CANCELLED}),
+}
+
+_TRANSITION_ERRORS = {
+    OrderStatus.CONFIRMED: "Only pending orders can be confirmed",
+    OrderStatus.SHIPPED: "Only confirmed orders can be shipped",
+    OrderStatus.DELIVERED: "Only shipped orders can be delivered",
+    OrderStatus.CANCELLED: "Cannot cancel shipped or delivered orders",
+}
+
+
 @dataclass
 class Order:
     id: Optional[int] = None
@@ -127,37 +153,38 @@ class Order:
         self.updated_at = datetime.now()
 
     def remove_item(self, product_id: int) -> None:
-        self.items = [item for item in self.items if item.product_id != product_id]
+        keep = 0
+        for item in self.items:
+            if item.product_id != product_id:
+                self.items[keep] = item
+                keep += 1
+        del self.items[keep:]
         self.updated_at = datetime.now()
 
-    def confirm(self) -> None:
-        if self.status != OrderStatus.PENDING:
-            raise ValueError("Only pending orders can be confirmed")
-        self.status = OrderStatus.CONFIRMED
+    def _transition(self, target: OrderStatus) -> None:
+        if self.status not in _ALLOWED_FROM[target]:
+            raise ValueError(_TRANSITION_ERRORS[target])
+        self.status = target
         self.updated_at = datetime.now()
 
+    def confirm(self) -> None:
+        self._transition(OrderStatus.CONFIRMED)
+
     def ship(self) -> None:
-        if self.status != OrderStatus.CONFIRMED:
-            raise ValueError("Only confirmed orders can be shipped")
-        self.status = OrderStatus.SHIPPED
-        self.updated_at = datetime.now()
+        self._transition(OrderStatus.SHIPPED)
 
     def deliver(self) -> None:
-        if self.status != OrderStatus.SHIPPED:
-            raise ValueError("Only shipped orders can be delivered")
-        self.status = OrderStatus.DELIVERED
-        self.updated_at = datetime.now()
+        self._transition(OrderStatus.DELIVERED)
 
     def cancel(self) -> None:
-        if self.status in [OrderStatus.SHIPPED, OrderStatus.DELIVERED]:
-            raise ValueError("Cannot cancel shipped or delivered orders")
-        self.status = OrderStatus.CANCELLED
-        self.updated_at = datetime.now()
+        self._transition(OrderStatus.CANCELLED)
 
-    def validate(self) -> List[str]:
-        errors = []
+    def validate(self) -> Sequence[str]:
+        errors = None
         if not self.user_id:
-            errors.append("User ID is required")
+            errors = ["User ID is required"]
         if not self.items:
+            if errors is None:
+                errors = []
             errors.append("Order must have at least one item")
-        return errors
+        return errors if errors is not None else _NO_ERRORS
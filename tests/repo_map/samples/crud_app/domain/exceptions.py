@@ -2,7 +2,7 @@ from typing import List, Optional
 
 
 class DomainException(Exception):
-    def __init__(self, message: str, code: Optional[str] = None):
+    def __init__(self, message: Optional[str], code: Optional[str] = None):
         super().__init__(message)
         self.message = message
         self.code = code or "DOMAIN_ERROR"
@@ -10,9 +10,26 @@ class DomainException(Exception):
 
 class ValidationError(DomainException):
     def __init__(self, errors: List[str]):
-        message = "; ".join(errors)
-        super().__init__(message, "VALIDATION_ERROR")
+        # The message is only joined when read (see the message property):
+        # callers that catch and inspect self.errors never pay for it
+        super().__init__(None, "VALIDATION_ERROR")
         self.errors = errors
+        # Keep the errors as the exception args so repr() shows them and
+        # pickle can rebuild it with ValidationError(errors)
+        self.args = (errors,)
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = "; ".join(self.errors)
+        return self._message
+
+    @message.setter
+    def message(self, value: Optional[str]) -> None:
+        self._message = value
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class NotFoundError(DomainException):
@@ -0,0 +1,42 @@
+"""
+Testes das exceções de domínio do sample crud_app.
+
+Execute com: pytest test_crud_app_exceptions.py -v
+"""
+
+import pickle
+
+from tests.repo_map.samples.crud_app.domain.exceptions import ValidationError
+
+
+class TestValidationError:
+    """Testes para ValidationError."""
+
+    def test_message_code_and_args(self):
+        error = ValidationError(["Name is required", "Invalid email format"])
+
+        assert str(error) == "Name is required; Invalid email format"
+        assert error.message == "Name is required; Invalid email format"
+        assert error.code == "VALIDATION_ERROR"
+        assert error.args == (["Name is required", "Invalid email format"],)
+        assert repr(error) == "ValidationError(['Name is required', 'Invalid email format'])"
+
+    def test_message_is_joined_only_when_read(self):
+        error = ValidationError(["Name is required"])
+
+        assert error._message is None
+        assert error.errors == ["Name is required"]
+
+        assert error.message == "Name is required"
+        assert error._message == "Name is required"
+
+    def test_pickle_round_trip(self):
+        error = ValidationError(["x", "y"])
+
+        restored = pickle.loads(pickle.dumps(error))
+
+        assert type(restored) is ValidationError
+        assert restored.errors == ["x", "y"]
+        assert restored.message == "x; y"
+        assert restored.code == "VALIDATION_ERROR"
+        assert str(restored) == "x; y"
@@ -4,9 +4,11 @@ Testes unitários para SimpleRepoMap.
 Execute com: pytest test_simple_repomap.py -v
 """
 
+import os
 from pathlib import Path
 
 import pytest
+from grep_ast.tsl import get_language
 
 from repo_graph.repo_map.simple_repomap import (
     SimpleRepoMap,
@@ -14,12 +16,28 @@ from repo_graph.repo_map.simple_repomap import (
     SymbolLocation,
     SymbolNavigation,
     MultiSymbolNavigation,
+    _borrow_parser,
+    _get_lang_bundle,
+    _pagerank,
     get_lang_from_filename,
     get_scm_path,
+    get_scm_query,
+    get_scm_query_compiled,
+    is_excluded,
+    resolve_file,
     SCM_FILES,
 )
 
 
+# Chamadas feitas por payloads do cache de tags (não deve haver nenhuma)
+_executed_cache_payloads = []
+
+
+def _record_cache_payload():
+    _executed_cache_payloads.append(True)
+    return []
+
+
 # =============================================================================
 # Fixtures - Dados de teste reutilizáveis
 # =============================================================================
@@ -108,6 +126,13 @@ class TestLanguageDetection:
         assert get_lang_from_filename("test.PY") == "python"
         assert get_lang_from_filename("test.Py") == "python"
 
+    def test_get_lang_from_filename_with_directories(self):
+        """Testa caminhos com diretórios e arquivos sem extensão."""
+        assert get_lang_from_filename("src/app/main.py") == "python"
+        assert get_lang_from_filename("pkg.v2/Makefile") is None
+        assert get_lang_from_filename("src/.py") is None
+        assert get_lang_from_filename(".py") is None
+
 
 # =============================================================================
 # Testes de Caminho SCM
@@ -134,6 +159,45 @@ class TestSCMPath:
         path = get_scm_path("unknown_language")
         assert path is None
 
+    def test_resolve_file_returns_lang_and_scm(self):
+        """Testa que resolve_file devolve linguagem e SCM num único lookup."""
+        assert resolve_file("src/main.py") == ("python", get_scm_path("python"))
+        assert resolve_file("App.TSX") == ("typescript", get_scm_path("typescript"))
+        assert resolve_file("readme.md") is None
+
+    def test_get_scm_query_is_cached(self):
+        """Testa que a query SCM é lida uma vez e reaproveitada."""
+        query = get_scm_query("python")
+        assert query == get_scm_path("python").read_text()
+        assert get_scm_query("python") is query
+        assert get_scm_query("unknown_language") is None
+
+    def test_get_scm_query_compiled_is_cached(self):
+        """Testa que a Query compilada é reaproveitada entre chamadas."""
+        query = get_scm_query_compiled("python", get_language("python"))
+        assert query is not None
+        assert get_scm_query_compiled("python", get_language("python")) is query
+
+    def test_borrow_parser_reuses_released_parsers(self):
+        """Testa que parsers devolvidos ao pool são reaproveitados."""
+        with _borrow_parser("python") as first:
+            # Enquanto emprestado, outro uso recebe um parser diferente
+            with _borrow_parser("python") as second:
+                assert second is not first
+
+        with _borrow_parser("python") as again:
+            assert again in (first, second)
+            assert again.parse(b"x = 1").root_node.type == "module"
+
+    def test_lang_bundle_capture_meta(self):
+        """Testa a classificação pré-calculada das capturas da query."""
+        _, _, capture_meta = _get_lang_bundle("python")
+
+        assert capture_meta["name.definition.class"] == ("def", "class")
+        assert capture_meta["name.reference.call"] == ("ref", "call")
+        # Capturas que não são nomes ficam de fora
+        assert "definition.class" not in capture_meta
+
     def test_all_scm_files_exist(self):
         """Verifica que todos os arquivos SCM mapeados existem."""
         for lang in SCM_FILES.keys():
@@ -234,6 +298,62 @@ class TestGetRepoMap:
         assert "app.py" in output
         assert "test_app.py" not in output
 
+    def test_excludes_with_wildcard(self, tmp_path):
+        """Testa exclusões customizadas com wildcard, por parte do caminho."""
+        (tmp_path / "app.py").write_text("def app(): pass")
+        (tmp_path / "app_generated.py").write_text("def gen(): pass")
+        (tmp_path / "build_out").mkdir()
+        (tmp_path / "build_out" / "lib.py").write_text("def lib(): pass")
+
+        mapper = SimpleRepoMap(root=str(tmp_path))
+        files = mapper._resolve_paths([tmp_path], excludes={"*_generated.py", "build_*"})
+
+        assert [rel for _, rel in files] == ["app.py"]
+
+    def test_excludes_apply_to_scanned_directory_ancestors(self, tmp_path):
+        """Testa exclusão quando o próprio diretório escaneado está excluído."""
+        (tmp_path / "tests" / "unit").mkdir(parents=True)
+        (tmp_path / "tests" / "unit" / "test_app.py").write_text("def test(): pass")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("def app(): pass")
+
+        mapper = SimpleRepoMap(root=str(tmp_path))
+
+        assert mapper._resolve_paths([tmp_path / "tests" / "unit"], excludes={"tests"}) == []
+        assert mapper._resolve_paths([tmp_path / "src"], excludes={"tests"}) == [
+            (str(tmp_path / "src" / "app.py"), os.path.join("src", "app.py"))
+        ]
+
+    def test_skips_files_above_max_file_bytes(self, tmp_path):
+        """Testa que arquivos grandes demais são ignorados e reportados."""
+        (tmp_path / "app.py").write_text("def app(): pass\n")
+        (tmp_path / "generated.py").write_text("def gen(): pass\n" * 100)
+
+        mapper = SimpleRepoMap(root=str(tmp_path), max_file_bytes=200)
+        output, report = mapper.get_repo_map(paths=[tmp_path])
+
+        assert "app.py" in output
+        assert "generated.py" not in output
+        assert "generated.py" in report.excluded
+        assert report.total_files_considered == 1
+
+        # None desativa o limite
+        unlimited = SimpleRepoMap(root=str(tmp_path), max_file_bytes=None)
+        output, _ = unlimited.get_repo_map(paths=[tmp_path])
+        assert "generated.py" in output
+
+    def test_skips_binary_files(self, tmp_path):
+        """Testa que arquivos binários com extensão suportada são ignorados."""
+        (tmp_path / "app.py").write_text("def app(): pass\n")
+        (tmp_path / "blob.py").write_bytes(b"\x80\x04\x95\x00\x00def fake(): pass\n")
+
+        mapper = SimpleRepoMap(root=str(tmp_path))
+        output, report = mapper.get_repo_map(paths=[tmp_path])
+
+        assert "app.py" in output
+        assert "blob.py" not in output
+        assert report.excluded["blob.py"] == "arquivo binário"
+
     def test_max_tokens(self, tmp_path):
         """Testa limite de tokens."""
         # Criar vários arquivos
@@ -353,6 +473,31 @@ class TestDefaultExcludes:
 
         assert report.total_files_considered == 1
 
+    def test_is_excluded_literals_and_globs(self):
+        """Testa is_excluded com nomes literais e padrões glob."""
+        assert is_excluded(".git")
+        assert is_excluded("node_modules")
+        assert is_excluded("mypackage.egg-info")
+        assert is_excluded(".venv311")
+        assert is_excluded("venv-dev")
+        assert not is_excluded("src")
+        assert not is_excluded("environment")
+
+    def test_resolve_paths_symlinks(self, tmp_path):
+        """Testa que links para arquivos entram e links para diretórios não."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("def app(): pass")
+        (tmp_path / "alias.py").symlink_to(tmp_path / "src" / "app.py")
+        (tmp_path / "mirror").symlink_to(tmp_path / "src", target_is_directory=True)
+
+        mapper = SimpleRepoMap(root=str(tmp_path))
+        found = mapper._resolve_paths([tmp_path])
+
+        assert sorted(found) == [
+            (str(tmp_path / "alias.py"), "alias.py"),
+            (str(tmp_path / "src" / "app.py"), os.path.join("src", "app.py")),
+        ]
+
 
 # =============================================================================
 # Testes de Múltiplas Linguagens
@@ -460,6 +605,22 @@ class User:
         # Deve mostrar a classe como contexto dos métodos
         assert "class User" in output
 
+    def test_reused_tree_context_matches_fresh_render(self, mapper):
+        """Testa que reaproveitar o TreeContext não vaza LOIs anteriores."""
+        code = (
+            "class A:\n"
+            "    def one(self):\n"
+            "        pass\n"
+            "\n"
+            "    def two(self):\n"
+            "        pass\n"
+        )
+        first = mapper.render_tree("a.py", code, [2, 5])
+        reused = mapper.render_tree("a.py", code, [2])
+
+        assert reused == SimpleRepoMap().render_tree("a.py", code, [2])
+        assert reused != first
+
 
 # =============================================================================
 # Testes de Token Counting
@@ -490,6 +651,10 @@ hello()
         assert tokens > 5
         assert tokens < 50
 
+    def test_token_count_special_token_text(self, mapper):
+        """Testa que marcadores de tokens especiais no código não quebram a contagem."""
+        assert mapper._token_count('STOP = "<|endoftext|>"') > 0
+
     def test_binary_search_efficiency(self, tmp_path):
         """Testa que busca binária é eficiente."""
         # Criar arquivo com muitas definições
@@ -632,6 +797,197 @@ class TestIntegration:
 
         assert output1 == output2
 
+    def test_parallel_read_matches_sequential(self, tmp_path, monkeypatch):
+        """Testa que a leitura com threads dá o mesmo resultado da sequencial."""
+        from repo_graph.repo_map import simple_repomap
+
+        for i in range(6):
+            (tmp_path / f"mod_{i}.py").write_text(f"def func_{i}():\n    pass\n")
+        (tmp_path / "legacy.py").write_bytes("nome = 'João'\n".encode("latin-1"))
+
+        mapper = SimpleRepoMap(root=str(tmp_path))
+        paths = mapper._resolve_paths([tmp_path])
+        sequential = mapper._read_files(paths)
+
+        # Forçar o caminho paralelo mesmo com poucos arquivos/núcleos
+        monkeypatch.setattr(simple_repomap, "_PARALLEL_READ_MIN_FILES", 2)
+        monkeypatch.setattr(simple_repomap.os, "cpu_count", lambda: 2)
+        parallel = mapper._read_files(paths)
+
+        assert list(parallel.items()) == list(sequential.items())
+
+    def test_tags_cache_reuses_unchanged_files(self, sample_project, monkeypatch):
+        """Testa que o cache em disco evita re-extrair tags de arquivos inalterados."""
+        cache_dir = sample_project / ".cache"  # .cache já é excluído do scan
+        first = SimpleRepoMap(root=str(sample_project), cache_dir=cache_dir).get_repo_map(
+            paths=[sample_project]
+        )
+
+        extracted = []
+        original_get_tags = SimpleRepoMap.get_tags
+
+        def spy_get_tags(self, fname, rel_fname, code):
+            extracted.append(rel_fname)
+            return original_get_tags(self, fname, rel_fname, code)
+
+        monkeypatch.setattr(SimpleRepoMap, "get_tags", spy_get_tags)
+
+        # Nova instância, nada mudou: todas as tags vêm do cache
+        second = SimpleRepoMap(root=str(sample_project), cache_dir=cache_dir).get_repo_map(
+            paths=[sample_project]
+        )
+        assert second == first
+        assert extracted == []
+
+        # Alterar um arquivo invalida apenas a entrada dele
+        utils = sample_project / "utils.py"
+        utils.write_text(utils.read_text() + "\ndef slugify(text):\n    return text\n")
+        third, _ = SimpleRepoMap(root=str(sample_project), cache_dir=cache_dir).get_repo_map(
+            paths=[sample_project]
+        )
+        assert extracted == ["utils.py"]
+        assert "slugify" in third
+
+    def test_tags_cache_does_not_execute_stored_payloads(self, sample_project, monkeypatch):
+        """Testa que entradas do cache fora do formato esperado são re-extraídas, sem executar nada."""
+        import pickle
+        import sqlite3
+        from repo_graph.repo_map import simple_repomap
+
+        cache_dir = sample_project / ".cache"
+        first = SimpleRepoMap(root=str(sample_project), cache_dir=cache_dir).get_repo_map(
+            paths=[sample_project]
+        )
+
+        # Payload que chamaria _record_cache_payload se fosse desserializado com pickle
+        class Payload:
+            def __reduce__(self):
+                return (_record_cache_payload, ())
+
+        with sqlite3.connect(str(cache_dir / simple_repomap._TAGS_CACHE_FILE)) as conn:
+            conn.execute("UPDATE tags SET tags = ?", (pickle.dumps(Payload()),))
+        conn.close()
+
+        second = SimpleRepoMap(root=str(sample_project), cache_dir=cache_dir).get_repo_map(
+            paths=[sample_project]
+        )
+
+        assert second == first
+        assert _executed_cache_payloads == []
+
+    def test_parallel_tag_extraction_matches_sequential(self, tmp_path, monkeypatch):
+        """Testa que a extração de tags em processos gera o mesmo mapa que a sequencial."""
+        from repo_graph.repo_map import simple_repomap
+
+        # Tamanhos diferentes: a ordem de despacho (maior primeiro) não é a
+        # ordem dos arquivos
+        for i in range(12):
+            (tmp_path / f"mod_{i}.py").write_text(
+                "# padding\n" * (i * 7 % 12)
+                + f"def func_{i}():\n    return func_{(i + 1) % 12}()\n"
+            )
+
+        mapper = SimpleRepoMap(root=str(tmp_path))
+        sequential = mapper.get_repo_map(paths=[tmp_path], chat_fnames={"mod_0.py"})
+
+        # Forçar o caminho paralelo mesmo com poucos arquivos/núcleos
+        monkeypatch.setattr(simple_repomap, "_PARALLEL_TAGS_MIN_FILES", 2)
+        monkeypatch.setattr(simple_repomap.os, "cpu_count", lambda: 2)
+        parallel = mapper.get_repo_map(paths=[tmp_path], chat_fnames={"mod_0.py"})
+
+        assert parallel == sequential
+
+
+# =============================================================================
+# Testes do PageRank
+# =============================================================================
+
+class TestPageRank:
+    """Testes para o PageRank por iteração de potência."""
+
+    def test_pagerank_two_nodes(self):
+        """Testa PageRank num grafo a -> b com personalização em a."""
+        ranks = _pagerank(["a", "b"], {("a", "b"): 1.0}, {"a": 100.0})
+
+        # b não tem saída: sua massa volta para a (única personalização)
+        # x_a = 0.15 + 0.85 * x_b, x_b = 0.85 * x_a
+        assert ranks["a"] == pytest.approx(0.15 / (1 - 0.85 ** 2), abs=1e-6)
+        assert ranks["b"] == pytest.approx(0.85 * ranks["a"], abs=1e-6)
+        assert sum(ranks.values()) == pytest.approx(1.0)
+
+    def test_pagerank_edge_weights(self):
+        """Testa que arestas com mais peso transferem mais rank."""
+        edges = {("a", "b"): 3.0, ("a", "c"): 1.0}
+        ranks = _pagerank(["a", "b", "c"], edges, {"a": 1.0})
+
+        assert ranks["b"] > ranks["c"]
+        assert sum(ranks.values()) == pytest.approx(1.0)
+
+    def test_pagerank_without_edges_is_personalization(self):
+        """Testa que sem arestas o rank é a personalização normalizada."""
+        nodes = ["a", "b", "c"]
+        personalization = {"a": 100.0, "b": 300.0}
+
+        ranks = _pagerank(nodes, {}, personalization)
+
+        assert ranks == {"a": 0.25, "b": 0.75, "c": 0.0}
+        # Mesmo ponto fixo da iteração completa (aresta de peso desprezível)
+        iterated = _pagerank(nodes, {("c", "a"): 1e-300}, personalization)
+        assert ranks == pytest.approx(iterated)
+
+    def test_generic_names_do_not_create_edges(self, tmp_path):
+        """Testa que nomes genéricos (stoplist) não ligam arquivos no grafo."""
+        (tmp_path / "main.py").write_text("def main():\n    run()\n    process()\n")
+        (tmp_path / "runner.py").write_text("def run():\n    pass\n")
+        (tmp_path / "worker.py").write_text("def process():\n    pass\n")
+        (tmp_path / "other.py").write_text("def other():\n    pass\n")
+
+        mapper = SimpleRepoMap(root=str(tmp_path))
+        files = mapper._read_files(mapper._resolve_paths([tmp_path]))
+        ranked_tags, _ = mapper._get_ranked_tags(files, chat_fnames={"main.py"})
+        rank_by_file = {tag.rel_fname: rank for rank, tag in ranked_tags}
+
+        # "process" liga main.py -> worker.py; "run" está na stoplist
+        assert rank_by_file["worker.py"] > rank_by_file["runner.py"]
+        assert rank_by_file["runner.py"] == pytest.approx(rank_by_file["other.py"])
+
+    def test_find_symbol_without_source_file_skips_pagerank(self, sample_project, monkeypatch):
+        """Testa que sem arquivo de origem o PageRank nem é executado."""
+        from repo_graph.repo_map import simple_repomap
+
+        def fail_pagerank(*args, **kwargs):
+            raise AssertionError("PageRank não deveria ser executado")
+
+        monkeypatch.setattr(simple_repomap, "_pagerank", fail_pagerank)
+
+        mapper = SimpleRepoMap(root=str(sample_project))
+        result = mapper.find_symbol("User", [sample_project])
+
+        assert result.found
+        assert all(loc.snippet for loc in result.definitions + result.references)
+
+    def test_find_symbol_only_parses_files_mentioning_symbol(self, tmp_path, monkeypatch):
+        """Testa o pré-filtro textual quando não há PageRank."""
+        (tmp_path / "models.py").write_text("class User:\n    pass\n")
+        (tmp_path / "main.py").write_text("from models import User\nUser()\n")
+        (tmp_path / "service.py").write_text("class UserService:\n    pass\n")
+
+        parsed = []
+        original_get_tags = SimpleRepoMap.get_tags
+
+        def spy_get_tags(self, fname, rel_fname, code):
+            parsed.append(rel_fname)
+            return original_get_tags(self, fname, rel_fname, code)
+
+        monkeypatch.setattr(SimpleRepoMap, "get_tags", spy_get_tags)
+
+        mapper = SimpleRepoMap(root=str(tmp_path))
+        result = mapper.find_symbol("User", [tmp_path])
+
+        # "UserService" não conta como ocorrência de "User"
+        assert sorted(parsed) == ["main.py", "models.py"]
+        assert [loc.file for loc in result.definitions] == ["models.py"]
+
 
 # =============================================================================
 # Testes do Verbose Mode
@@ -937,6 +1293,45 @@ class TestTagSubkind:
         assert len(ref_tags) > 0
         assert ref_tags[0].subkind == "call"
 
+    def test_get_tags_accepts_bytes(self, sample_project):
+        """Testa que bytes UTF-8 produzem as mesmas tags que o texto."""
+        mapper = SimpleRepoMap(root=str(sample_project))
+        path = sample_project / "models.py"
+
+        from_text = mapper.get_tags(str(path), "models.py", path.read_text())
+        from_bytes = mapper.get_tags(str(path), "models.py", path.read_bytes())
+
+        assert from_bytes == from_text
+
+    def test_read_files_encoding_and_newlines(self, tmp_path):
+        """Testa fallback para latin-1 e normalização de CRLF na leitura."""
+        (tmp_path / "crlf.py").write_bytes(b"x = 1\r\ny = 2\r\n")
+        (tmp_path / "legacy.py").write_bytes("nome = 'João'\n".encode("latin-1"))
+
+        mapper = SimpleRepoMap(root=str(tmp_path))
+        files = mapper._read_files(mapper._resolve_paths([tmp_path]))
+
+        assert files["crlf.py"] == "x = 1\ny = 2\n"
+        assert files["legacy.py"] == "nome = 'João'\n"
+
+    def test_read_files_large_files_via_mmap(self, tmp_path, monkeypatch):
+        """Testa que arquivos grandes (mapeados em memória) são lidos igual."""
+        from repo_graph.repo_map import simple_repomap
+
+        monkeypatch.setattr(simple_repomap, "_MMAP_MIN_BYTES", 16)
+        (tmp_path / "crlf.py").write_bytes(b"x = 1\r\n" * 10)
+        (tmp_path / "legacy.py").write_bytes("nome = 'João'\n".encode("latin-1") * 10)
+        (tmp_path / "huge.py").write_bytes(b"y = 2\n" * 100)
+
+        mapper = SimpleRepoMap(root=str(tmp_path), max_file_bytes=300)
+        excluded = {}
+        files = mapper._read_files(mapper._resolve_paths([tmp_path]), excluded)
+
+        assert files["crlf.py"] == "x = 1\n" * 10
+        assert files["legacy.py"] == "nome = 'João'\n" * 10
+        assert "huge.py" not in files
+        assert excluded == {"huge.py": "maior que 300 bytes"}
+
 
 # =============================================================================
 # Testes do SymbolNavigation.render()
@@ -1050,6 +1445,25 @@ user3 = User()
         # main.py deve aparecer apenas uma vez (refs agrupadas)
         assert output.count("main.py:") == 1
 
+    def test_repeated_render_reuses_tree_context(self, project_with_context):
+        """Testa que renders repetidos reaproveitam o TreeContext sem mudar o output."""
+        (project_with_context / "models.py").write_text(
+            (project_with_context / "models.py").read_text() + "\nADMIN = User('root')\n"
+        )
+        mapper = SimpleRepoMap(root=str(project_with_context))
+
+        def fresh(**kwargs):
+            return mapper.find_symbol("User", [project_with_context]).render(**kwargs)
+
+        result = mapper.find_symbol("User", [project_with_context])
+        assert result.render(include_references=True) == fresh(include_references=True)
+        assert result.render() == fresh()
+        assert result.render(include_references=True) == fresh(include_references=True)
+        # Um TreeContext por arquivo e configuração (definição / referência)
+        assert set(result._tree_contexts) == {
+            ("models.py", 8, True), ("models.py", 4, False), ("main.py", 4, False),
+        }
+
 
 # =============================================================================
 # Testes para find_symbols() e MultiSymbolNavigation
@@ -1256,3 +1670,61 @@ product = Product("Widget")
 
         # Agregado deve ser menor (menos duplicação)
         assert len(aggregated_output) < len(individual_output)
+
+    def test_render_max_tokens_limits_file_blocks(self, render_project):
+        """Testa que max_tokens limita os blocos de código renderizados."""
+        mapper = SimpleRepoMap(root=str(render_project))
+        result = mapper.find_symbols(["User", "Product"], [render_project])
+
+        full_output = result.render(include_references=True)
+        limited_output = result.render(include_references=True, max_tokens=0)
+
+        # Sem espaço para nenhum bloco, mas cabeçalhos continuam presentes
+        assert "models.py:" not in limited_output
+        assert "main.py:" not in limited_output
+        assert "Definitions" in limited_output
+        assert "References" in limited_output
+
+        # Limite folgado não altera o output
+        assert result.render(include_references=True, max_tokens=100_000) == full_output
+
+    def test_render_max_tokens_reports_omitted_files(self, render_project):
+        """Testa que o render indica quantos arquivos foram cortados pelo max_tokens."""
+        mapper = SimpleRepoMap(root=str(render_project))
+        result = mapper.find_symbols(["User", "Product"], [render_project])
+
+        limited_output = result.render(include_references=True, max_tokens=0)
+
+        # models.py nas definições; main.py nas referências
+        definitions, references = limited_output.split("ℹ️ References")
+        assert "… 1 more files omitted (max_tokens=0)" in definitions
+        assert "… 1 more files omitted (max_tokens=0)" in references
+
+        # Sem corte, nenhum aviso
+        assert "omitted" not in result.render(include_references=True)
+        assert "omitted" not in result.render(include_references=True, max_tokens=100_000)
+
+    def test_concurrent_render_matches_serial(self, tmp_path, monkeypatch):
+        """Testa que definições e referências do mesmo arquivo renderizadas em paralelo saem iguais ao render serial."""
+        from concurrent.futures import ThreadPoolExecutor
+        from repo_graph.repo_map import simple_repomap
+
+        # Cada arquivo define e usa User: definição e referência do mesmo
+        # arquivo vão para threads diferentes
+        for i in range(4):
+            body = "".join(f"def f{j}():\n    return User()\n\n" for j in range(1500))
+            (tmp_path / f"mod_{i}.py").write_text(f"class User:\n    pass\n\n{body}")
+        mapper = SimpleRepoMap(root=str(tmp_path))
+
+        serial_nav = mapper.find_symbols(["User"], [tmp_path])
+        with monkeypatch.context() as m:
+            m.setattr(
+                simple_repomap, "ThreadPoolExecutor",
+                lambda max_workers: ThreadPoolExecutor(max_workers=1),
+            )
+            serial = serial_nav.render(include_references=True)
+        assert serial.count("█class User:") == 4
+
+        result = mapper.find_symbols(["User"], [tmp_path])
+        for _ in range(5):
+            assert result.render(include_references=True) == serial
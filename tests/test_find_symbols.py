@@ -1,8 +1,23 @@
+import pickle
+import sqlite3
+import tempfile
 import unittest
 from pathlib import Path
 from typing import override
+from unittest import mock
 
-from repo_graph.repo import FileUsages
+from repo_graph.repo import FileUsages, Repository
+from repo_graph import symbol_finder
+from repo_graph.symbol_finder import SymbolFinder, SymbolLocation, SymbolReference, SymbolUsages
+
+
+# Chamadas feitas por payloads do cache de capturas (não deve haver nenhuma)
+_executed_cache_payloads = []
+
+
+def _record_cache_payload():
+    _executed_cache_payloads.append(True)
+    return {}
 
 
 class FindSimbolsTest(unittest.TestCase):
@@ -78,3 +93,135 @@ class FindSimbolsTest(unittest.TestCase):
         self.assertEqual(1, len(symbol_usages.find_references_of("service.py")))
         self.assertEqual(2, len(symbol_usages.find_references_of("handler.py")))
 
+
+    def test_repeated_lookups_reuse_parsed_trees(self):
+        # scenario: duas buscas no mesmo FileUsages
+        file_usages = FileUsages(
+            source_file=self.USE_CASES_DIR / "find_class_and_attributes_usages_1/model.py",
+            file_usages=[
+                self.USE_CASES_DIR / "find_class_and_attributes_usages_1/handler.py",
+                self.USE_CASES_DIR / "find_class_and_attributes_usages_1/service.py",
+            ]
+        )
+        first = file_usages.find_symbol_references(qualified_name="class:User")
+        trees = {path: entry[2] for path, entry in file_usages._finder._tree_cache.items()}
+
+        # action
+        second = file_usages.find_symbol_references(qualified_name="class:User")
+
+        # validation: mesmas referências, sem reparsear nenhum arquivo
+        self.assertEqual(first.references, second.references)
+        self.assertEqual(3, len(trees))
+        for path, entry in file_usages._finder._tree_cache.items():
+            self.assertIs(trees[path], entry[2])
+
+    def test_disk_cache_reuses_captures_across_finders(self):
+        # scenario: cache em disco populado por uma primeira busca
+        use_case_dir = self.USE_CASES_DIR / "find_class_and_attributes_usages_1"
+        dependent_files = [use_case_dir / "handler.py", use_case_dir / "service.py"]
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = SymbolFinder(cache_dir=cache_dir).find_references(
+                use_case_dir / "model.py", dependent_files, "class:User.email"
+            )
+
+            # action: nova instância (como em uma nova execução)
+            finder = SymbolFinder(cache_dir=cache_dir)
+            second = finder.find_references(
+                use_case_dir / "model.py", dependent_files, "class:User.email"
+            )
+
+        # validation: mesmas referências, sem parsear nenhum arquivo
+        self.assertEqual(6, len(second.references))
+        self.assertEqual(first.references, second.references)
+        self.assertEqual(first.definition_location, second.definition_location)
+        self.assertIsNone(finder._parser)
+
+    def test_repository_cache_dir_reaches_symbol_finder(self):
+        # scenario: repositório com cache em disco
+        use_case_dir = self.USE_CASES_DIR / "find_class_and_attributes_usages_1"
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            repo = Repository(use_case_dir, cache_dir=cache_dir)
+            first = repo.find_usages(use_case_dir / "model.py").find_symbol_references("class:User.email")
+
+            # action: novo repositório com o mesmo cache (como em uma nova execução)
+            other = Repository(use_case_dir, cache_dir=cache_dir)
+            second = other.find_usages(use_case_dir / "model.py").find_symbol_references("class:User.email")
+
+            cache_file = Path(cache_dir) / symbol_finder._CAPTURES_CACHE_FILE
+            self.assertTrue(cache_file.is_file())
+
+        # validation: o parse da primeira busca passa pelo cache de árvores
+        # e a segunda usa só as capturas gravadas
+        self.assertEqual(6, len(first.references))
+        self.assertEqual(first.references, second.references)
+        self.assertEqual(3, len(repo._finder._tree_cache))
+        self.assertIsNone(other._finder._parser)
+
+    def test_find_references_of_by_path_parent_and_name(self):
+        # scenario: referências em dois arquivos com o mesmo nome
+        def ref(path):
+            location = SymbolLocation(Path(path), line=1, column=0, end_column=4, context_line="User()")
+            return SymbolReference(location, reference_type="instantiation", symbol_name="User")
+
+        a, b = ref("/repo/app/handler.py"), ref("/repo/api/handler.py")
+        usages = SymbolUsages(symbol_name="class:User", definition_location=None, references=[a, b, a])
+
+        # action & validation: caminho completo, pasta + nome e só o nome
+        self.assertEqual([b], usages.find_references_of(Path("/repo/api/handler.py")))
+        self.assertEqual([a, a], usages.find_references_of("other/app/handler.py"))
+        self.assertEqual([a, b, a], usages.find_references_of("handler.py"))
+        self.assertEqual([], usages.find_references_of("service.py"))
+
+    def test_parallel_search_matches_sequential(self):
+        # scenario: dependentes suficientes para a busca em processos
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_dir = Path(tmp)
+            model = tmp_dir / "model.py"
+            model.write_text("class User:\n    email: str = ''\n")
+            dependent_files = []
+            for i in range(40):
+                path = tmp_dir / f"mod_{i}.py"
+                path.write_text(
+                    "from model import User\n" + "\n" * (i % 5)
+                    + f"user_{i} = User()\nprint(user_{i}.email, User.email)\n"
+                )
+                dependent_files.append(path)
+
+            sequential = SymbolFinder().find_references(model, dependent_files, "class:User.email")
+
+            # action
+            with mock.patch.object(symbol_finder.os, "cpu_count", lambda: 2):
+                parallel = SymbolFinder().find_references(model, dependent_files, "class:User.email")
+
+        # validation
+        self.assertEqual(80, len(sequential.references))
+        self.assertEqual(sequential.references, parallel.references)
+
+    def test_disk_cache_does_not_execute_stored_payloads(self):
+        # scenario: cache populado e depois adulterado com um payload pickle
+        use_case_dir = self.USE_CASES_DIR / "find_class_and_attributes_usages_1"
+        dependent_files = [use_case_dir / "handler.py", use_case_dir / "service.py"]
+
+        class Payload:
+            def __reduce__(self):
+                return (_record_cache_payload, ())
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = SymbolFinder(cache_dir=cache_dir).find_references(
+                use_case_dir / "model.py", dependent_files, "class:User.email"
+            )
+            conn = sqlite3.connect(str(Path(cache_dir) / symbol_finder._CAPTURES_CACHE_FILE))
+            with conn:
+                conn.execute("UPDATE captures SET captures = ?", (pickle.dumps(Payload()),))
+            conn.close()
+
+            # action
+            second = SymbolFinder(cache_dir=cache_dir).find_references(
+                use_case_dir / "model.py", dependent_files, "class:User.email"
+            )
+
+        # validation: entradas inválidas são refeitas, sem executar o payload
+        self.assertEqual(first.references, second.references)
+        self.assertEqual([], _executed_cache_payloads)